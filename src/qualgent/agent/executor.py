@@ -5,10 +5,19 @@ from __future__ import annotations
 from pathlib import Path
 
 from qualgent.agent.types import Action, ActionType, ErrorType, StepResult
-from qualgent.tools.adb_controller import AdbController, AdbError
+from qualgent.tools.adb_controller import (
+    AdbController,
+    AdbError,
+    CompiledSequence,
+    _sleep_command,
+    escape_input_text,
+)
 
 __all__ = ["Executor", "ExecutorError"]
 
+# Echoed after each batched command so a failed batch shows how far it got
+_STEP_MARKER = "__QG_STEP__"
+
 
 class ExecutorError(Exception):
     """Raised when action execution fails."""
@@ -88,19 +97,24 @@ class Executor:
                 error_message=str(exc),
             )
         except AdbError as exc:
-            # Determine error type from ADB error
-            error_type = ErrorType.ADB_FAILURE
-            msg = str(exc).lower()
-            if "not found" in msg:
-                error_type = ErrorType.ELEMENT_NOT_FOUND
-            elif "timed out" in msg or "timeout" in msg:
-                error_type = ErrorType.TIMEOUT
-            return StepResult(
-                action=action,
-                success=False,
-                error_type=error_type,
-                error_message=str(exc),
-            )
+            return self._adb_failure(action, exc)
+
+    @staticmethod
+    def _adb_failure(action: Action, exc: AdbError) -> StepResult:
+        """Build a failed StepResult, classifying the ADB error."""
+        # Determine error type from ADB error
+        error_type = ErrorType.ADB_FAILURE
+        msg = str(exc).lower()
+        if "not found" in msg:
+            error_type = ErrorType.ELEMENT_NOT_FOUND
+        elif "timed out" in msg or "timeout" in msg:
+            error_type = ErrorType.TIMEOUT
+        return StepResult(
+            action=action,
+            success=False,
+            error_type=error_type,
+            error_message=str(exc),
+        )
 
     def execute_all(
         self,
@@ -115,15 +129,29 @@ class Executor:
         actions
             Actions to execute.
         screenshot_dir
-            If provided, take a screenshot after each action.
+            If provided, take a screenshot after each action. Otherwise,
+            adjacent actions that map to plain shell commands (taps, typing,
+            keys, ...) are sent to the device in a single adb call.
 
         Returns
         -------
         list[StepResult]
-            Results for each action.
+            Results for each action, stopping at the first failure.
         """
         results: list[StepResult] = []
 
+        # Without per-step screenshots, runs of actions that map to plain
+        # shell commands are sent to the device in one adb call.
+        if screenshot_dir is None:
+            for group in self._batch_groups(actions):
+                if isinstance(group, list):
+                    results.extend(self._execute_batch(group))
+                else:
+                    results.append(self.execute(group))
+                if not results[-1].success:
+                    break
+            return results
+
         for i, action in enumerate(actions):
             result = self.execute(action)
 
@@ -144,6 +172,143 @@ class Executor:
 
         return results
 
+    def _batch_groups(
+        self, actions: list[Action]
+    ) -> list[Action | list[tuple[Action, str]]]:
+        """Split *actions* into runs of batchable (action, command) pairs and lone actions.
+
+        Runs of a single action are left as plain actions.
+        """
+        groups: list[Action | list[tuple[Action, str]]] = []
+        run: list[tuple[Action, str]] = []
+
+        def flush() -> None:
+            if len(run) == 1:
+                groups.append(run[0][0])
+            elif run:
+                groups.append(list(run))
+            run.clear()
+
+        for action in actions:
+            try:
+                run.append((action, self._action_to_shell(action)))
+            except ExecutorError:
+                flush()
+                groups.append(action)
+        flush()
+        return groups
+
+    def _execute_batch(self, batch: list[tuple[Action, str]]) -> list[StepResult]:
+        """Run a group of batchable actions in one adb call.
+
+        Each command but the last is followed by an ``echo`` of a step
+        marker, so when the chain stops early the output shows which
+        actions completed and the failure is reported on the one that
+        actually failed.
+        """
+        print(f"      [Batch] Running {len(batch)} actions in one adb call")
+        cmds: list[str] = []
+        for i, (_, cmd) in enumerate(batch):
+            cmds.append(cmd)
+            if i < len(batch) - 1:
+                cmds.append(f"echo {_STEP_MARKER}{i}")
+        try:
+            self._adb.execute_batch(cmds)
+        except AdbError as exc:
+            done = (exc.stdout or "").count(_STEP_MARKER)
+            results = [
+                StepResult(action=action, success=True, error_type=ErrorType.NONE)
+                for action, _ in batch[:done]
+            ]
+            results.append(self._adb_failure(batch[done][0], exc))
+            return results
+        return [
+            StepResult(action=action, success=True, error_type=ErrorType.NONE)
+            for action, _ in batch
+        ]
+
+    def compile_actions(self, actions: list[Action]) -> CompiledSequence:
+        """Compile a fixed list of actions into a script stored on the device.
+
+        Useful for replaying a known trajectory: every later
+        ``CompiledSequence.run()`` executes all actions in one adb
+        round-trip. Only actions that need no live UI lookup can be
+        compiled (taps, swipes, typing, keys, app lifecycle and waits).
+
+        Parameters
+        ----------
+        actions
+            Actions to compile, in order.
+
+        Returns
+        -------
+        CompiledSequence
+            Handle whose ``run()`` replays the actions.
+
+        Raises
+        ------
+        ExecutorError
+            If an action cannot be compiled or has invalid params.
+        AdbError
+            If the script cannot be written to the device.
+        """
+        return self._adb.compile_sequence([self._action_to_shell(a) for a in actions])
+
+    def _action_to_shell(self, action: Action) -> str:
+        """Return the ``adb shell`` command line for a compilable action."""
+        params = action.params
+        match action.action_type:
+            case ActionType.TAP:
+                px, py = self._tap_pixels(params)
+                return f"input tap {px} {py}"
+
+            case ActionType.SWIPE:
+                px1, py1, px2, py2, duration = self._swipe_pixels(params)
+                return f"input swipe {px1} {py1} {px2} {py2} {duration}"
+
+            case ActionType.TYPE_TEXT:
+                text = params.get("text", "")
+                if not text:
+                    raise ExecutorError("type_text requires 'text' param", ErrorType.INVALID_PARAMS)
+                return f"input text {escape_input_text(text)}"
+
+            case ActionType.KEY_EVENT:
+                key_code = params.get("key_code")
+                if key_code is None:
+                    raise ExecutorError("key_event requires 'key_code' param", ErrorType.INVALID_PARAMS)
+                return f"input keyevent {int(key_code)}"
+
+            case ActionType.BACK:
+                return "input keyevent 4"
+
+            case ActionType.HOME:
+                return "input keyevent 3"
+
+            case ActionType.LAUNCH_APP:
+                return f"monkey -p {self._package(action)} -c android.intent.category.LAUNCHER 1"
+
+            case ActionType.FORCE_STOP:
+                return f"am force-stop {self._package(action)}"
+
+            case ActionType.CLEAR_DATA:
+                return f"pm clear {self._package(action)}"
+
+            case ActionType.RELAUNCH_APP:
+                package = self._package(action)
+                return (
+                    f"am force-stop {package} && sleep 0.5 && "
+                    f"monkey -p {package} -c android.intent.category.LAUNCHER 1"
+                )
+
+            case ActionType.WAIT:
+                return _sleep_command(float(params.get("seconds", 1.0)))
+
+            case _:
+                raise ExecutorError(
+                    f"{action.action_type.value} needs the live UI and cannot be compiled",
+                    ErrorType.INVALID_PARAMS,
+                )
+
     def _execute_action(self, action: Action) -> None:
         """Internal action dispatch."""
         match action.action_type:
@@ -233,13 +398,29 @@ class Executor:
             case _:
                 raise ExecutorError(f"Unknown action type: {action.action_type}", ErrorType.UNKNOWN)
 
-    def _do_tap(self, params: dict) -> None:
-        """Execute a tap action."""
+    @staticmethod
+    def _package(action: Action) -> str:
+        """Return the action's 'package' param, which must be non-empty."""
+        package = action.params.get("package", "")
+        if not package:
+            raise ExecutorError(
+                f"{action.action_type.value} requires 'package' param", ErrorType.INVALID_PARAMS
+            )
+        return package
+
+    def _tap_pixels(self, params: dict) -> tuple[int, int]:
+        """Validate tap params and return the target in pixels."""
         x = params.get("x")
         y = params.get("y")
         if x is None or y is None:
             raise ExecutorError("tap requires 'x' and 'y' params")
-        px, py = self._normalized_to_pixels(float(x), float(y))
+        return self._normalized_to_pixels(float(x), float(y))
+
+    def _do_tap(self, params: dict) -> None:
+        """Execute a tap action."""
+        x = params.get("x")
+        y = params.get("y")
+        px, py = self._tap_pixels(params)
         print(f"      [Tap] normalized=({x:.2f}, {y:.2f}) -> pixels=({px}, {py})")
         self._adb.tap_coordinates(px, py)
 
@@ -253,8 +434,8 @@ class Executor:
         result = self._adb.tap_text(text, partial=partial)
         print(f"      {result}")
 
-    def _do_swipe(self, params: dict) -> None:
-        """Execute a swipe action."""
+    def _swipe_pixels(self, params: dict) -> tuple[int, int, int, int, int]:
+        """Validate swipe params and return (x1, y1, x2, y2, duration_ms) in pixels."""
         x1 = params.get("x1")
         y1 = params.get("y1")
         x2 = params.get("x2")
@@ -263,7 +444,11 @@ class Executor:
             raise ExecutorError("swipe requires 'x1', 'y1', 'x2', 'y2' params", ErrorType.INVALID_PARAMS)
         px1, py1 = self._normalized_to_pixels(float(x1), float(y1))
         px2, py2 = self._normalized_to_pixels(float(x2), float(y2))
-        duration = int(params.get("duration_ms", 300))
+        return px1, py1, px2, py2, int(params.get("duration_ms", 300))
+
+    def _do_swipe(self, params: dict) -> None:
+        """Execute a swipe action."""
+        px1, py1, px2, py2, duration = self._swipe_pixels(params)
         print(f"      [Swipe] ({px1}, {py1}) -> ({px2}, {py2}), duration={duration}ms")
         self._adb.swipe(px1, py1, px2, py2, duration)
 
@@ -9,6 +9,9 @@ from qualgent.agent.types import Action, ActionType, Observation, PlannerRespons
 
 __all__ = ["Planner", "PlannerError"]
 
+# action_type string -> ActionType, matched case-insensitively
+_ACTION_MAP: dict[str, ActionType] = {t.value: t for t in ActionType}
+
 
 class LLMClient(Protocol):
     """Protocol for LLM clients (Gemini or OpenAI)."""
@@ -256,46 +259,33 @@ Remember: only use tap_text with text from VISIBLE_UI_TEXTS!"""
             step_context=step_context,
         )
 
+    @staticmethod
+    def _parse_action(raw_action: dict[str, Any]) -> Action:
+        """Build an Action from one raw action dict from the LLM."""
+        raw_type = raw_action.get("action_type", "")
+        action_type = _ACTION_MAP.get(str(raw_type).lower())
+        if action_type is None:
+            raise PlannerError(f"Invalid action_type: {raw_type}")
+        return Action(
+            action_type=action_type,
+            params=raw_action.get("params", {}),
+            description=raw_action.get("description", ""),
+        )
+
     def _parse_response(self, data: dict[str, Any]) -> PlannerResponse:
         """Parse and validate the LLM response."""
         actions: list[Action] = []
 
         # New format: single "action" key
         if "action" in data:
-            raw_action = data["action"]
-            try:
-                action_type = ActionType(raw_action.get("action_type", ""))
-            except ValueError:
-                raise PlannerError(
-                    f"Invalid action_type: {raw_action.get('action_type')}"
-                )
-            actions.append(
-                Action(
-                    action_type=action_type,
-                    params=raw_action.get("params", {}),
-                    description=raw_action.get("description", ""),
-                )
-            )
+            actions.append(self._parse_action(data["action"]))
         # Legacy format: "actions" list
         elif "actions" in data:
             raw_actions = data.get("actions", [])
             if not isinstance(raw_actions, list):
                 raise PlannerError(f"Expected 'actions' to be a list, got: {type(raw_actions)}")
 
-            for raw_action in raw_actions:
-                try:
-                    action_type = ActionType(raw_action.get("action_type", ""))
-                except ValueError:
-                    raise PlannerError(
-                        f"Invalid action_type: {raw_action.get('action_type')}"
-                    )
-                actions.append(
-                    Action(
-                        action_type=action_type,
-                        params=raw_action.get("params", {}),
-                        description=raw_action.get("description", ""),
-                    )
-                )
+            actions.extend(self._parse_action(raw) for raw in raw_actions)
 
         return PlannerResponse(
             actions=actions,
@@ -5,6 +5,7 @@ from __future__ import annotations
 import argparse
 import json
 import sys
+import time
 from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
@@ -298,7 +299,6 @@ class Runner:
 
                 # Add delay between steps to avoid rate limits (especially for OpenAI)
                 if iteration > 1:
-                    import time
                     time.sleep(1.0)  # 1 second delay between steps
 
                 print(f"  [Step {iteration}] Capturing observation and planning...")
@@ -570,6 +570,12 @@ def main() -> None:
         default=DEFAULT_MAX_SCROLLS_PER_STEP,
         help=f"Max scroll attempts when element not found (default: {DEFAULT_MAX_SCROLLS_PER_STEP})",
     )
+    parser.add_argument(
+        "--persistent-shell",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Reuse one adb shell session for shell commands (default: on)",
+    )
 
     args = parser.parse_args()
 
@@ -606,34 +612,37 @@ def main() -> None:
     print(f"App package: {package}")
 
     # Initialize components
-    adb = AdbController(device_serial=args.serial, timeout_s=30.0)
-
-    # Verify device and package
-    if not adb.is_package_installed(package):
-        print(f"ERROR: Package {package} is not installed on {args.serial}")
-        sys.exit(1)
-
-    # Initialize LLM client based on provider
-    if args.provider == "openai":
-        model = args.model or "gpt-5-mini"
-        llm_client = OpenAIClient(model=model)
-        print(f"Using provider: OpenAI, model: {model}")
-    else:
-        model = args.model or "gemini-2.0-flash"
-        llm_client = GeminiClient(model=model)
-        print(f"Using provider: Gemini, model: {model}")
-
-    # Run tests
-    runner = Runner(
-        adb,
-        llm_client,
-        run_dir,
-        package,
-        fresh=args.fresh,
-        max_retries_per_step=args.max_retries,
-        max_scrolls_per_step=args.max_scrolls,
-    )
-    report = runner.run_suite(tests)
+    with AdbController(
+        device_serial=args.serial,
+        timeout_s=30.0,
+        persistent_shell=args.persistent_shell,
+    ) as adb:
+        # Verify device and package
+        if not adb.is_package_installed(package):
+            print(f"ERROR: Package {package} is not installed on {args.serial}")
+            sys.exit(1)
+
+        # Initialize LLM client based on provider
+        if args.provider == "openai":
+            model = args.model or "gpt-5-mini"
+            llm_client = OpenAIClient(model=model)
+            print(f"Using provider: OpenAI, model: {model}")
+        else:
+            model = args.model or "gemini-2.0-flash"
+            llm_client = GeminiClient(model=model)
+            print(f"Using provider: Gemini, model: {model}")
+
+        # Run tests
+        runner = Runner(
+            adb,
+            llm_client,
+            run_dir,
+            package,
+            fresh=args.fresh,
+            max_retries_per_step=args.max_retries,
+            max_scrolls_per_step=args.max_scrolls,
+        )
+        report = runner.run_suite(tests)
 
     # Exit with error code if any tests had unexpected outcomes
     unexpected = 0
@@ -2,13 +2,25 @@
 
 from __future__ import annotations
 
+import io
 from pathlib import Path
 from typing import Any, Protocol
 
 from qualgent.agent.types import SupervisorVerdict, TestStatus
 
+try:  # Pillow (or the drop-in Pillow-SIMD) shrinks screenshots before upload
+    from PIL import Image
+except ImportError:
+    Image = None  # type: ignore[assignment]
+
 __all__ = ["Supervisor", "SupervisorError"]
 
+# Verdict strings the LLM may return; anything else counts as FAILED
+_STATUS_MAP: dict[str, TestStatus] = {
+    "PASSED": TestStatus.PASSED,
+    "FAILED": TestStatus.FAILED,
+}
+
 
 class LLMClient(Protocol):
     """Protocol for LLM clients (Gemini or OpenAI)."""
@@ -17,7 +29,7 @@ class LLMClient(Protocol):
         self,
         prompt: str,
         *,
-        images: list[Path] | None = None,
+        images: list[Path | bytes] | None = None,
         temperature: float = 0.1,
         max_tokens: int = 4096,
     ) -> dict[str, Any]: ...
@@ -67,17 +79,42 @@ class Supervisor:
     ----------
     llm_client
         LLM client for API calls (GeminiClient or OpenAIClient).
+    max_image_side
+        Larger screenshots are downscaled to fit this many pixels per side
+        and re-encoded as JPEG before upload, which cuts a 1-2 MB PNG to a
+        few hundred KB; images that already fit are sent unchanged. Needs
+        Pillow (the ``vision`` extra); without it, or with ``None``, images
+        are always sent unchanged.
     """
 
-    def __init__(self, llm_client: LLMClient) -> None:
+    def __init__(self, llm_client: LLMClient, *, max_image_side: int | None = 1024) -> None:
         self._client = llm_client
+        self._max_image_side = max_image_side
+
+    def _prepare_image(self, image: Path | bytes) -> Path | bytes:
+        """Downscale an oversized *image* to JPEG bytes, or return it unchanged."""
+        if Image is None or self._max_image_side is None:
+            return image
+        try:
+            with Image.open(io.BytesIO(image) if isinstance(image, bytes) else image) as im:
+                if max(im.size) <= self._max_image_side:
+                    return image
+                im.thumbnail(
+                    (self._max_image_side, self._max_image_side), Image.Resampling.BOX
+                )
+                buf = io.BytesIO()
+                im.convert("RGB").save(buf, "JPEG", quality=85)
+        except (OSError, ValueError):
+            # Unreadable or unsupported image; let the LLM client handle it as-is.
+            return image
+        return buf.getvalue()
 
     def verify_step(
         self,
         expected_result: str,
-        screenshot_path: Path,
+        screenshot_path: Path | bytes,
         *,
-        before_screenshot: Path | None = None,
+        before_screenshot: Path | bytes | None = None,
         ui_texts: list[str] | None = None,
         additional_context: str = "",
     ) -> SupervisorVerdict:
@@ -88,9 +125,10 @@ class Supervisor:
         expected_result
             Description of what should be visible/true.
         screenshot_path
-            Path to current (after) screenshot.
+            Current (after) screenshot, as a file path or raw PNG bytes
+            (e.g. from ``AdbController.capture_screenshot_bytes``).
         before_screenshot
-            Optional path to before screenshot for comparison.
+            Optional before screenshot for comparison, as a path or bytes.
         ui_texts
             List of visible text labels from UI dump (ground truth).
         additional_context
@@ -106,11 +144,11 @@ class Supervisor:
         SupervisorError
             If verification fails.
         """
-        images = [screenshot_path]
+        images = [self._prepare_image(screenshot_path)]
         image_desc = "the screenshot"
 
-        if before_screenshot:
-            images = [before_screenshot, screenshot_path]
+        if before_screenshot is not None:
+            images.insert(0, self._prepare_image(before_screenshot))
             image_desc = "the BEFORE and AFTER screenshots (in order)"
 
         # Build UI texts section
@@ -148,7 +186,7 @@ Output your verdict as JSON."""
         self,
         test_goal: str,
         expected_result: str,
-        final_screenshot: Path,
+        final_screenshot: Path | bytes,
         *,
         action_history: list[str] | None = None,
         ui_texts: list[str] | None = None,
@@ -162,7 +200,7 @@ Output your verdict as JSON."""
         expected_result
             What success should look like.
         final_screenshot
-            Screenshot of final state.
+            Screenshot of final state, as a file path or raw PNG bytes.
         action_history
             List of actions that were taken.
         ui_texts
@@ -201,7 +239,7 @@ Output your verdict as JSON."""
         try:
             response = self._client.generate_json(
                 prompt,
-                images=[final_screenshot],
+                images=[self._prepare_image(final_screenshot)],
                 temperature=0.1,
             )
         except Exception as exc:
@@ -211,15 +249,9 @@ Output your verdict as JSON."""
 
     def _parse_response(self, data: dict[str, Any]) -> SupervisorVerdict:
         """Parse and validate the Gemini response."""
-        status_str = data.get("status", "").upper()
-
-        if status_str == "PASSED":
-            status = TestStatus.PASSED
-        elif status_str == "FAILED":
-            status = TestStatus.FAILED
-        else:
-            # Default to failed if unclear
-            status = TestStatus.FAILED
+        status_str = str(data.get("status") or "").strip().upper()
+        # Default to failed if unclear
+        status = _STATUS_MAP.get(status_str, TestStatus.FAILED)
 
         return SupervisorVerdict(
             status=status,
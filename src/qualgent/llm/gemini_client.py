@@ -12,6 +12,9 @@ from typing import Any
 import httpx
 from dotenv import load_dotenv
 
+from qualgent.llm.images import image_mime_type
+from qualgent.llm.json_utils import json_loads
+
 __all__ = ["GeminiClient", "GeminiError"]
 
 # Load .env from project root
@@ -64,21 +67,11 @@ class GeminiClient:
         self._timeout = timeout_s
         self._client = httpx.Client(timeout=self._timeout)
 
-    def _encode_image(self, image_path: Path) -> dict[str, Any]:
-        """Encode an image file as base64 inline data for Gemini."""
-        data = image_path.read_bytes()
+    def _encode_image(self, image: Path | bytes) -> dict[str, Any]:
+        """Encode an image file, or raw image bytes, as base64 inline data for Gemini."""
+        data = image if isinstance(image, bytes) else image.read_bytes()
         b64 = base64.b64encode(data).decode("utf-8")
-
-        # Determine MIME type
-        suffix = image_path.suffix.lower()
-        mime_map = {
-            ".png": "image/png",
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".gif": "image/gif",
-            ".webp": "image/webp",
-        }
-        mime_type = mime_map.get(suffix, "image/png")
+        mime_type = image_mime_type(image)
 
         return {
             "inline_data": {
@@ -91,7 +84,7 @@ class GeminiClient:
         self,
         prompt: str,
         *,
-        images: list[Path] | None = None,
+        images: list[Path | bytes] | None = None,
         temperature: float = 0.2,
         max_tokens: int = 4096,
     ) -> str:
@@ -102,7 +95,7 @@ class GeminiClient:
         prompt
             Text prompt to send.
         images
-            Optional list of image paths to include for vision tasks.
+            Optional images (file paths or raw PNG/JPEG bytes) for vision tasks.
         temperature
             Sampling temperature (0-1). Lower = more deterministic.
         max_tokens
@@ -123,8 +116,8 @@ class GeminiClient:
 
         # Add images first (if any)
         if images:
-            for img_path in images:
-                parts.append(self._encode_image(img_path))
+            for img in images:
+                parts.append(self._encode_image(img))
 
         # Add text prompt
         parts.append({"text": prompt})
@@ -188,7 +181,7 @@ class GeminiClient:
         self,
         prompt: str,
         *,
-        images: list[Path] | None = None,
+        images: list[Path | bytes] | None = None,
         temperature: float = 0.1,
         max_tokens: int = 4096,
         retry_on_parse_error: bool = True,
@@ -268,7 +261,7 @@ class GeminiClient:
 
         # Try direct parse
         try:
-            return json.loads(text)
+            return json_loads(text)
         except json.JSONDecodeError:
             pass
 
@@ -277,7 +270,7 @@ class GeminiClient:
         end = text.rfind("}") + 1
         if start != -1 and end > start:
             try:
-                return json.loads(text[start:end])
+                return json_loads(text[start:end])
             except json.JSONDecodeError:
                 pass
 
@@ -292,4 +285,3 @@ class GeminiClient:
 
     def __exit__(self, *args: Any) -> None:
         self.close()
-
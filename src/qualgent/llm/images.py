@@ -0,0 +1,37 @@
+"""Image helpers shared by the LLM clients."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+__all__ = ["image_mime_type"]
+
+# Leading bytes of the image formats the APIs accept, for in-memory images
+_IMAGE_SIGNATURES = (
+    (b"\x89PNG", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF8", "image/gif"),
+    (b"RIFF", "image/webp"),
+)
+
+_SUFFIX_MIME_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+}
+
+
+def image_mime_type(image: Path | bytes) -> str:
+    """Return the MIME type of an image file or of raw image bytes.
+
+    Files are typed by extension and bytes by their leading signature.
+    Anything unrecognised is assumed to be PNG, the screenshot format.
+    """
+    if isinstance(image, bytes):
+        return next(
+            (mime for magic, mime in _IMAGE_SIGNATURES if image.startswith(magic)),
+            "image/png",
+        )
+    return _SUFFIX_MIME_TYPES.get(image.suffix.lower(), "image/png")
@@ -0,0 +1,14 @@
+"""JSON decoding shared by the LLM clients."""
+
+from __future__ import annotations
+
+import json
+
+__all__ = ["json_loads"]
+
+try:  # orjson parses model responses several times faster than json
+    import orjson
+
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
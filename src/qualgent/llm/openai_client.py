@@ -13,6 +13,9 @@ from typing import Any
 import httpx
 from dotenv import load_dotenv
 
+from qualgent.llm.images import image_mime_type
+from qualgent.llm.json_utils import json_loads
+
 __all__ = ["OpenAIClient", "OpenAIError"]
 
 # Load .env from project root
@@ -65,21 +68,11 @@ class OpenAIClient:
         self._timeout = timeout_s
         self._client = httpx.Client(timeout=self._timeout)
 
-    def _encode_image(self, image_path: Path) -> dict[str, Any]:
-        """Encode an image file as base64 data URL for OpenAI."""
-        data = image_path.read_bytes()
+    def _encode_image(self, image: Path | bytes) -> dict[str, Any]:
+        """Encode an image file, or raw image bytes, as base64 data URL for OpenAI."""
+        data = image if isinstance(image, bytes) else image.read_bytes()
         b64 = base64.b64encode(data).decode("utf-8")
-
-        # Determine MIME type
-        suffix = image_path.suffix.lower()
-        mime_map = {
-            ".png": "image/png",
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".gif": "image/gif",
-            ".webp": "image/webp",
-        }
-        mime_type = mime_map.get(suffix, "image/png")
+        mime_type = image_mime_type(image)
 
         return {
             "type": "image_url",
@@ -93,7 +86,7 @@ class OpenAIClient:
         self,
         prompt: str,
         *,
-        images: list[Path] | None = None,
+        images: list[Path | bytes] | None = None,
         temperature: float = 0.2,
         max_tokens: int = 4096,
     ) -> str:
@@ -104,7 +97,7 @@ class OpenAIClient:
         prompt
             Text prompt to send.
         images
-            Optional list of image paths to include for vision tasks.
+            Optional images (file paths or raw PNG/JPEG bytes) for vision tasks.
         temperature
             Sampling temperature (0-1). Lower = more deterministic.
         max_tokens
@@ -125,8 +118,8 @@ class OpenAIClient:
 
         # Add images first (if any)
         if images:
-            for img_path in images:
-                content.append(self._encode_image(img_path))
+            for img in images:
+                content.append(self._encode_image(img))
 
         # Add text prompt
         content.append({"type": "text", "text": prompt})
@@ -204,7 +197,7 @@ class OpenAIClient:
         self,
         prompt: str,
         *,
-        images: list[Path] | None = None,
+        images: list[Path | bytes] | None = None,
         temperature: float = 0.1,
         max_tokens: int = 4096,
         retry_on_parse_error: bool = True,
@@ -284,7 +277,7 @@ class OpenAIClient:
 
         # Try direct parse
         try:
-            return json.loads(text)
+            return json_loads(text)
         except json.JSONDecodeError:
             pass
 
@@ -294,7 +287,7 @@ class OpenAIClient:
         if start != -1 and end > start:
             json_text = text[start:end]
             try:
-                return json.loads(json_text)
+                return json_loads(json_text)
             except json.JSONDecodeError:
                 pass
 
@@ -302,7 +295,7 @@ class OpenAIClient:
             # Remove trailing commas before } or ]
             fixed = re.sub(r',(\s*[}\]])', r'\1', json_text)
             try:
-                return json.loads(fixed)
+                return json_loads(fixed)
             except json.JSONDecodeError:
                 pass
 
@@ -310,7 +303,7 @@ class OpenAIClient:
             # Pattern: "value"\n    "key" should become "value",\n    "key"
             fixed = re.sub(r'(")\s*\n(\s*")', r'\1,\n\2', fixed)
             try:
-                return json.loads(fixed)
+                return json_loads(fixed)
             except json.JSONDecodeError:
                 pass
 
@@ -325,4 +318,3 @@ class OpenAIClient:
 
     def __exit__(self, *args: Any) -> None:
         self.close()
-
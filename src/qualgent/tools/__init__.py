@@ -1,5 +1,17 @@
 """Tools module for ADB interaction."""
 
-from qualgent.tools.adb_controller import AdbController, AdbError
+from qualgent.tools.adb_backend import AdbBackend, MockAdbBackend, SubprocessBackend
+from qualgent.tools.adb_controller import AdbController, AdbError, CompiledSequence
+from qualgent.tools.adb_pool import AdbControllerPool
+from qualgent.tools.async_adb_controller import AsyncAdbController
 
-__all__ = ["AdbController", "AdbError"]
+__all__ = [
+    "AdbBackend",
+    "AdbController",
+    "AdbControllerPool",
+    "AdbError",
+    "AsyncAdbController",
+    "CompiledSequence",
+    "MockAdbBackend",
+    "SubprocessBackend",
+]
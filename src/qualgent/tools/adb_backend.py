@@ -0,0 +1,157 @@
+"""Pluggable process backends for :class:`~qualgent.tools.adb_controller.AdbController`.
+
+The controller builds adb argv lists and hands them to a backend to run.
+:class:`SubprocessBackend` (the default) spawns real processes;
+:class:`MockAdbBackend` answers from canned responses and records every
+call, for tests and for latency/error injection.
+"""
+
+from __future__ import annotations
+
+import subprocess
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import IO, TYPE_CHECKING, Any, Protocol, Union
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Sequence
+
+__all__ = ["AdbBackend", "MockAdbBackend", "MockCall", "SubprocessBackend"]
+
+# A canned reply: a finished process, an exception to raise (e.g.
+# subprocess.TimeoutExpired), or a callable computing either from the argv.
+MockResponse = Union[
+    subprocess.CompletedProcess,
+    BaseException,
+    Callable[[list[str]], Union[subprocess.CompletedProcess, BaseException]],
+]
+
+
+class AdbBackend(Protocol):
+    """Runs one adb command to completion."""
+
+    def run(
+        self,
+        cmd: Sequence[str],
+        *,
+        binary: bool = False,
+        stdout: IO[bytes] | None = None,
+        timeout: float | None = None,
+        cwd: Path | None = None,
+        **kwargs: Any,
+    ) -> subprocess.CompletedProcess:
+        """Run *cmd* and return the finished process.
+
+        Output is text unless *binary* is True. If *stdout* is given, the
+        command's output is written to it and ``stdout`` on the result is
+        None. Raises :class:`subprocess.TimeoutExpired` after *timeout*.
+        """
+        ...
+
+
+class SubprocessBackend:
+    """Backend that runs commands with :func:`subprocess.run`."""
+
+    def run(
+        self,
+        cmd: Sequence[str],
+        *,
+        binary: bool = False,
+        stdout: IO[bytes] | None = None,
+        timeout: float | None = None,
+        cwd: Path | None = None,
+        **kwargs: Any,
+    ) -> subprocess.CompletedProcess:
+        """Run *cmd* in a child process (extra *kwargs* go to ``subprocess.run``)."""
+        streams: dict[str, Any] = (
+            {"capture_output": True}
+            if stdout is None
+            else {"stdout": stdout, "stderr": subprocess.PIPE}
+        )
+        return subprocess.run(
+            cmd,
+            check=False,
+            stdin=subprocess.DEVNULL,
+            **streams,
+            text=not binary,
+            timeout=timeout,
+            cwd=cwd,
+            **kwargs,
+        )
+
+
+@dataclass(frozen=True)
+class MockCall:
+    """One command received by :class:`MockAdbBackend`."""
+
+    cmd: list[str]
+    binary: bool
+    timeout: float | None
+
+
+class MockAdbBackend:
+    """Backend that answers from canned responses instead of running adb.
+
+    Parameters
+    ----------
+    responses
+        Replies keyed by the full argv tuple, e.g.
+        ``{("adb", "shell", "wm", "size"): CompletedProcess(...)}``.
+    default
+        Reply for commands not in *responses*. Defaults to an empty,
+        successful result.
+
+    Attributes
+    ----------
+    calls
+        Every command received, in order.
+    """
+
+    def __init__(
+        self,
+        responses: Mapping[tuple[str, ...], MockResponse] | None = None,
+        *,
+        default: MockResponse | None = None,
+    ) -> None:
+        self.responses: dict[tuple[str, ...], MockResponse] = dict(responses or {})
+        self.default = default
+        self.calls: list[MockCall] = []
+
+    def run(
+        self,
+        cmd: Sequence[str],
+        *,
+        binary: bool = False,
+        stdout: IO[bytes] | None = None,
+        timeout: float | None = None,
+        cwd: Path | None = None,
+        **kwargs: Any,
+    ) -> subprocess.CompletedProcess:
+        """Record *cmd* and return (or raise) its canned reply."""
+        argv = list(cmd)
+        self.calls.append(MockCall(argv, binary, timeout))
+
+        reply = self.responses.get(tuple(argv), self.default)
+        if reply is None:
+            reply = subprocess.CompletedProcess(argv, 0, "", "")
+        elif callable(reply) and not isinstance(reply, BaseException):
+            reply = reply(argv)
+        if isinstance(reply, BaseException):
+            raise reply
+
+        out = _coerce(reply.stdout, binary)
+        err = _coerce(reply.stderr, binary)
+        if stdout is not None:
+            stdout.write(out)  # type: ignore[arg-type]
+            out = None
+        return subprocess.CompletedProcess(argv, reply.returncode, out, err)
+
+
+def _coerce(value: str | bytes | None, binary: bool) -> str | bytes:
+    """Return *value* as bytes if *binary*, else as str."""
+    if value is None:
+        value = ""
+    if binary:
+        return value.encode() if isinstance(value, str) else value
+    return value.decode(errors="replace") if isinstance(value, bytes) else value
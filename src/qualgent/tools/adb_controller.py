@@ -2,15 +2,80 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
+import html
+import io
+import os
+import queue
+import re
+import shlex
+import shutil
 import subprocess
+import threading
 import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import IO, TYPE_CHECKING, Any, Literal
+
+from qualgent.tools.adb_backend import SubprocessBackend
+from qualgent.tools.adb_socket import AdbSocketClient
 
 if TYPE_CHECKING:
-    from typing import Sequence
+    from typing import Iterable, Iterator, Sequence
+
+    from qualgent.tools.adb_backend import AdbBackend
+
+try:  # lxml parses large UI dumps in C; fall back to the stdlib parser
+    from lxml import etree as _etree
+
+    _HAVE_LXML = True
+except ImportError:
+    _etree = ET
+    _HAVE_LXML = False
+
+__all__ = ["AdbController", "AdbError", "CompiledSequence", "escape_input_text"]
+
+# Extra Popen arguments for every adb spawn. On Windows, keep adb from
+# flashing a console window per call. On POSIX, skipping the close_fds sweep
+# lets subprocess use its posix_spawn fast path (once adb_path is resolved
+# to an absolute path and cwd is unset); Python's own descriptors are
+# non-inheritable, so nothing extra leaks into adb.
+_SPAWN_KWARGS: dict[str, Any] = (
+    {"creationflags": subprocess.CREATE_NO_WINDOW} if os.name == "nt" else {"close_fds": False}
+)
+
+_WM_SIZE_RE = re.compile(r"Physical size:\s*(\d+)x(\d+)")
+_GETEVENT_DEVICE_RE = re.compile(r"add device \d+:\s*(\S+)")
+_GETEVENT_MAX_X_RE = re.compile(r"ABS_MT_POSITION_X\s*:.*?max (\d+)")
+_GETEVENT_MAX_Y_RE = re.compile(r"ABS_MT_POSITION_Y\s*:.*?max (\d+)")
+_BOUNDS_RE = re.compile(r"\[(\d+),(\d+)\]\[(\d+),(\d+)\]")
+_ACTIVITY_RE = re.compile(r"m(?:Resumed|Focused)Activity[^\n]*?([\w.]+/[\w.$]+)")
+_UI_ATTR_RE = re.compile(rb'\s(?:text|content-desc|hint)="([^"]*)"')
+
+# DEL presses used by tap_and_type when the field's content is unknown
+_DEFAULT_CLEAR_COUNT = 30
 
-__all__ = ["AdbController", "AdbError"]
+# stderr fragments adb prints when it cannot reach (or restart) the server
+_DAEMON_DOWN_MARKERS = ("cannot connect to daemon", "daemon not running")
+
+# Printed after every command sent to a persistent shell, followed by $?
+_SHELL_MARKER = b"__QGEND__"
+
+# Linux input event codes used to script touch gestures with sendevent
+_EV_SYN, _EV_KEY, _EV_ABS = 0, 1, 3
+_BTN_TOUCH = 330
+_ABS_MT_POSITION_X, _ABS_MT_POSITION_Y, _ABS_MT_TRACKING_ID = 53, 54, 57
+
+# Translation table for ADB `input text`: spaces become %s and shell
+# metacharacters (including the glob characters * and ?) are
+# backslash-escaped. A single translate pass handles backslashes without
+# the double-escaping risk of chained replaces.
+_ADB_ESCAPE_TABLE = str.maketrans(
+    {c: f"\\{c}" for c in "'\"`$()&|;<>*?"} | {" ": "%s", "\\": "\\\\"}
+)
 
 
 class AdbError(Exception):
@@ -30,7 +95,400 @@ class AdbError(Exception):
         self.stderr = stderr
 
 
-class AdbController:
+def escape_input_text(text: str) -> str:
+    """Escape *text* for ``adb shell input text``.
+
+    Spaces become ``%s`` and shell metacharacters are backslash-escaped.
+    """
+    return text.translate(_ADB_ESCAPE_TABLE)
+
+
+def _sleep_command(seconds: float) -> str:
+    """Return a device ``sleep`` command for *seconds*, to the millisecond.
+
+    Always fixed-point: toybox ``sleep`` rejects exponent notation such as
+    ``1e-05``, which ``:g`` formatting produces for small values.
+    """
+    value = f"{seconds:.3f}".rstrip("0").rstrip(".")
+    return f"sleep {value}"
+
+
+@dataclass(frozen=True)
+class CompiledSequence:
+    """A shell command sequence stored on the device by
+    :meth:`AdbController.compile_sequence`.
+
+    Attributes
+    ----------
+    controller
+        Controller the script was uploaded through.
+    path
+        On-device path of the script.
+    commands
+        Shell commands in the script, in order.
+    """
+
+    controller: AdbController
+    path: str
+    commands: tuple[str, ...]
+
+    def run(self) -> str:
+        """Run the whole sequence in one ``adb shell`` round-trip.
+
+        Raises
+        ------
+        AdbError
+            If any command in the sequence fails.
+        """
+        self.controller._run(["shell", "sh", self.path])
+        return f"Ran {len(self.commands)} command(s) from {self.path}"
+
+
+# ---------------------------------------------------------------------- #
+# Output parsing shared by the sync and async controllers
+# ---------------------------------------------------------------------- #
+
+
+def _parse_screen_size(output: str) -> tuple[int, int]:
+    """Parse ``wm size`` output into (width, height)."""
+    # Output format: "Physical size: 1080x1920", optionally followed by
+    # an "Override size:" line, which is ignored.
+    m = _WM_SIZE_RE.search(output)
+    if not m:
+        raise AdbError(f"Could not parse screen size from: {output}")
+    return int(m[1]), int(m[2])
+
+
+def _as_xml_bytes(xml_content: str | bytes) -> bytes:
+    """Return *xml_content* as bytes (lxml rejects str with an encoding declaration)."""
+    return xml_content.encode() if isinstance(xml_content, str) else xml_content
+
+
+def _iter_nodes(xml_content: str | bytes) -> Iterator[Any]:
+    """Stream ``<node>`` elements from a UI dump, clearing each once consumed.
+
+    Nodes are yielded on their start tag, so they come in document order
+    (parents before children), but without their children. Attributes
+    must be read before advancing the iterator.
+    """
+    source = io.BytesIO(_as_xml_bytes(xml_content))
+    if _HAVE_LXML:
+        events = _etree.iterparse(source, events=("start", "end"), tag="node")
+    else:
+        events = _etree.iterparse(source, events=("start", "end"))
+    for event, elem in events:
+        if elem.tag != "node":
+            continue
+        if event == "start":
+            yield elem
+        else:
+            elem.clear()
+
+
+def _parse_packages(output: str) -> frozenset[str]:
+    """Parse ``pm list packages`` output into a set of package names."""
+    return frozenset(
+        line.strip()[len("package:"):]
+        for line in output.splitlines()
+        if line.startswith("package:")
+    )
+
+
+def _parse_ui_texts(xml_content: str | bytes) -> list[str]:
+    """Extract text, content-desc and hint labels from a UI Automator dump.
+
+    Returns an empty list if the dump cannot be parsed.
+    """
+    texts: list[str] = []
+    try:
+        for elem in _iter_nodes(xml_content):
+            elem_text = elem.get("text", "").strip()
+            content_desc = elem.get("content-desc", "").strip()
+            hint = elem.get("hint", "").strip()
+            if elem_text:
+                texts.append(elem_text)
+            if content_desc and content_desc != elem_text:
+                texts.append(content_desc)
+            # Include hint (placeholder text) for input fields
+            if hint and hint != elem_text and hint != content_desc:
+                texts.append(hint)
+    except _etree.ParseError:
+        return []  # Return empty list on parse failure
+
+    return texts
+
+
+def _daemon_unreachable(stderr: str | bytes) -> bool:
+    """Return True if *stderr* says the adb server could not be reached."""
+    if isinstance(stderr, bytes):
+        stderr = stderr.decode(errors="replace")
+    return any(marker in stderr for marker in _DAEMON_DOWN_MARKERS)
+
+
+def _strip_dump_banner(raw: bytes) -> bytes:
+    """Drop the "UI hierchary dumped to" banner that follows a streamed dump."""
+    end = raw.rfind(b"</hierarchy>")
+    return raw if end == -1 else raw[: end + len(b"</hierarchy>")]
+
+
+def _iter_attr_values(xml_content: bytes) -> Iterator[str]:
+    """Yield non-empty text, content-desc and hint values from a raw UI dump.
+
+    Scans the bytes with a regex instead of building a tree, so callers
+    that only need a membership test can stop at the first hit.
+    """
+    for m in _UI_ATTR_RE.finditer(xml_content):
+        value = html.unescape(m[1].decode("utf-8", errors="replace")).strip()
+        if value:
+            yield value
+
+
+def _contains_text(ui_texts: Iterable[str], text: str, partial: bool) -> bool:
+    """Return True if *text* is among *ui_texts* (substring match if partial)."""
+    if partial:
+        text_lower = text.lower()
+        return any(text_lower in t.lower() for t in ui_texts)
+    return any(t == text for t in ui_texts)
+
+
+@functools.lru_cache(maxsize=256)
+def _element_priority(clickable: str | None, focusable: str | None, elem_class: str) -> int:
+    """Score how good an element is to tap (higher is better).
+
+    Dumps repeat the same few attribute combinations many times, so the
+    substring checks run once per distinct combination.
+    """
+    score = 0
+    # Clickable elements are highest priority
+    if clickable == "true":
+        score += 100
+    # Check element class for interactive types
+    if "Button" in elem_class:
+        score += 50
+    if "EditText" in elem_class or "Input" in elem_class:
+        score += 50
+    if "CheckBox" in elem_class or "Switch" in elem_class or "Radio" in elem_class:
+        score += 40
+    # Focusable elements are somewhat interactive
+    if focusable == "true":
+        score += 10
+    return score
+
+
+def _find_text_element(xml_content: str | bytes, text: str, partial: bool) -> Any:
+    """Locate the best element to tap for *text* in a UI dump.
+
+    Raises
+    ------
+    AdbError
+        If the dump cannot be parsed or no element matches.
+    """
+    # Parse XML and find element
+    try:
+        root = _etree.fromstring(_as_xml_bytes(xml_content))
+    except _etree.ParseError as exc:
+        raise AdbError(f"Failed to parse UI dump: {exc}")
+
+    # Single pass: keep the highest-priority match (includes hint/placeholder
+    # text). Interactive elements (buttons, inputs) beat static text; ties go
+    # to the element that appears first in the dump.
+    text_lower = text.lower()
+    found_element = None
+    best_score = -1
+    for elem in root.iter("node"):
+        get = elem.get
+        elem_text = get("text", "")
+        content_desc = get("content-desc", "")
+        hint = get("hint", "")  # Placeholder text for input fields
+
+        if partial:
+            matched = (
+                text_lower in elem_text.lower()
+                or text_lower in content_desc.lower()
+                or text_lower in hint.lower()
+            )
+        else:
+            matched = elem_text == text or content_desc == text or hint == text
+        if not matched:
+            continue
+
+        score = _element_priority(get("clickable"), get("focusable"), get("class", ""))
+        if score > best_score:
+            found_element, best_score = elem, score
+
+    if found_element is None:
+        raise AdbError(f"Element with text '{text}' not found on screen")
+    return found_element
+
+
+def _element_center(elem: Any) -> tuple[int, int]:
+    """Return the center point of a dumped element's bounds.
+
+    Raises
+    ------
+    AdbError
+        If the element has unparseable bounds.
+    """
+    bounds_str = elem.get("bounds", "")
+    # bounds format: "[left,top][right,bottom]"
+    match = _BOUNDS_RE.match(bounds_str)
+    if not match:
+        raise AdbError(f"Could not parse bounds: {bounds_str}")
+
+    left, top, right, bottom = map(int, match.groups())
+    return (left + right) // 2, (top + bottom) // 2
+
+
+def _find_text_center(xml_content: str | bytes, text: str, partial: bool) -> tuple[int, int]:
+    """Locate the best element matching *text* and return its center point."""
+    return _element_center(_find_text_element(xml_content, text, partial))
+
+
+def _clear_count(elem: Any) -> int:
+    """Return how many DEL presses clear *elem*, or a safe default if unknown."""
+    if "EditText" in elem.get("class", ""):
+        # An empty field may report its placeholder as text; deleting on an
+        # empty field is harmless, so len(text) is always enough.
+        return len(elem.get("text", ""))
+    return _DEFAULT_CLEAR_COUNT
+
+
+def _scroll_vector(
+    width: int, height: int, direction: str
+) -> tuple[int, int, int, int]:
+    """Return swipe coordinates (x1, y1, x2, y2) that scroll in *direction*."""
+    cx, cy = width // 2, height // 2
+
+    # Define swipe vectors based on direction
+    swipe_map = {
+        "down": (cx, int(height * 0.7), cx, int(height * 0.3)),
+        "up": (cx, int(height * 0.3), cx, int(height * 0.7)),
+        "left": (int(width * 0.7), cy, int(width * 0.3), cy),
+        "right": (int(width * 0.3), cy, int(width * 0.7), cy),
+    }
+
+    if direction not in swipe_map:
+        raise AdbError(f"Invalid scroll direction: {direction}")
+
+    return swipe_map[direction]
+
+
+def _parse_current_activity(output: str) -> str:
+    """Extract the resumed/focused activity from ``dumpsys activity`` output."""
+    m = _ACTIVITY_RE.search(output)
+    return m[1] if m else ""
+
+
+def _parse_last_frame_end(output: str) -> int | None:
+    """Return the latest ``FrameCompleted`` timestamp from gfxinfo framestats.
+
+    Returns None when the output contains no frame data (e.g. the app
+    has not rendered anything yet).
+    """
+    latest: int | None = None
+    column: int | None = None
+    for line in output.splitlines():
+        line = line.strip()
+        if line.startswith("Flags,"):
+            header = line.split(",")
+            column = header.index("FrameCompleted") if "FrameCompleted" in header else None
+            continue
+        if column is None or not line or line.startswith("---"):
+            continue
+        fields = line.split(",")
+        if len(fields) > column and fields[column].isdigit():
+            value = int(fields[column])
+            if latest is None or value > latest:
+                latest = value
+    return latest
+
+
+def _parse_touch_device(output: str) -> tuple[str, int, int] | None:
+    """Find the multi-touch device in ``getevent -pl`` output.
+
+    Returns
+    -------
+    tuple[str, int, int] | None
+        (device path, max X, max Y) of the first device reporting
+        ``ABS_MT_POSITION_X``/``Y`` axes, or None if there is none.
+    """
+    for block in output.split("add device")[1:]:
+        device = _GETEVENT_DEVICE_RE.match("add device" + block)
+        max_x = _GETEVENT_MAX_X_RE.search(block)
+        max_y = _GETEVENT_MAX_Y_RE.search(block)
+        if device and max_x and max_y:
+            return device[1], int(max_x[1]), int(max_y[1])
+    return None
+
+
+def _pump_lines(stream: IO[bytes], lines: queue.Queue[bytes | None]) -> None:
+    """Copy *stream* into *lines* line by line; put None at EOF."""
+    for line in iter(stream.readline, b""):
+        lines.put(line)
+    lines.put(None)
+
+
+class _BaseAdbController:
+    """State and helpers shared by :class:`AdbController` and its async variant."""
+
+    def __init__(
+        self,
+        device_serial: str | None = None,
+        *,
+        adb_path: str = "adb",
+        timeout_s: float | None = None,
+        cwd: Path | None = None,
+    ) -> None:
+        self._device_serial = device_serial
+        # Resolve against PATH once instead of on every spawn.
+        self._adb_path = shutil.which(adb_path) or adb_path
+        self._timeout_s = timeout_s
+        self._cwd = cwd
+        # The prefix never changes for an instance, so build it once.
+        self._base_cmd_tuple: tuple[str, ...] = (
+            (self._adb_path, "-s", device_serial) if device_serial else (self._adb_path,)
+        )
+        # Device properties that are stable for a session, queried lazily.
+        self._screen_size: tuple[int, int] | None = None
+        self._touch_device: tuple[str, int, int] | None = None
+        self._packages: frozenset[str] | None = None
+
+    def invalidate_cache(self) -> None:
+        """Forget cached device info (e.g. after a rotation or an app install)."""
+        self._screen_size = None
+        self._touch_device = None
+        self._packages = None
+
+    def _base_cmd(self) -> list[str]:
+        """Return the base command prefix (adb or adb -s <serial>)."""
+        return list(self._base_cmd_tuple)
+
+    def _build_cmd(self, args: Sequence[str]) -> list[str]:
+        """Return the full argv for *args* in a single list build."""
+        return [*self._base_cmd_tuple, *args]
+
+    def _timeout_error(self, cmd: Sequence[str]) -> AdbError:
+        """Build the error raised when a command exceeds ``timeout_s``."""
+        return AdbError(f"Command timed out after {self._timeout_s}s: {' '.join(cmd)}")
+
+    @staticmethod
+    def _command_error(
+        cmd: Sequence[str],
+        returncode: int,
+        stdout: str | None,
+        stderr: str,
+    ) -> AdbError:
+        """Build the error raised when a command exits non-zero."""
+        details = f"stderr: {stderr}" if stdout is None else f"stdout: {stdout}\nstderr: {stderr}"
+        return AdbError(
+            f"ADB command failed (exit {returncode}): {' '.join(cmd)}\n{details}",
+            returncode=returncode,
+            stdout=stdout,
+            stderr=stderr,
+        )
+
+
+class AdbController(_BaseAdbController):
     """Wrapper around ADB (Android Debug Bridge) subprocess calls.
 
     Parameters
@@ -44,6 +502,22 @@ class AdbController:
         Timeout in seconds for each subprocess call. ``None`` means no timeout.
     cwd
         Working directory for subprocess calls. ``None`` uses the current directory.
+    persistent_shell
+        If True, ``shell`` commands are sent to one long-lived ``adb shell``
+        session instead of spawning a new adb process per call. The session
+        is started on first use; call :meth:`close` (or use the controller
+        as a context manager) to end it. Binary and host-side commands
+        always use a fresh subprocess.
+    backend
+        Runs each non-persistent adb command. Defaults to
+        :class:`~qualgent.tools.adb_backend.SubprocessBackend`; pass a
+        :class:`~qualgent.tools.adb_backend.MockAdbBackend` in tests.
+    transport
+        ``"cli"`` (default) runs the ``adb`` client binary. ``"socket"``
+        sends ``shell`` commands straight to the adb server on
+        ``127.0.0.1:5037`` without spawning a process; binary and
+        host-side commands still use the backend. Cannot be combined
+        with *persistent_shell*.
     """
 
     def __init__(
@@ -53,98 +527,298 @@ class AdbController:
         adb_path: str = "adb",
         timeout_s: float | None = None,
         cwd: Path | None = None,
+        persistent_shell: bool = False,
+        backend: AdbBackend | None = None,
+        transport: Literal["cli", "socket"] = "cli",
     ) -> None:
-        self._device_serial = device_serial
-        self._adb_path = adb_path
-        self._timeout_s = timeout_s
-        self._cwd = cwd
+        if transport not in ("cli", "socket"):
+            raise ValueError(f"transport must be 'cli' or 'socket', got {transport!r}")
+        if transport == "socket" and persistent_shell:
+            raise ValueError("persistent_shell cannot be used with transport='socket'")
+        super().__init__(device_serial, adb_path=adb_path, timeout_s=timeout_s, cwd=cwd)
+        self._socket = (
+            AdbSocketClient(device_serial, timeout_s=timeout_s)
+            if transport == "socket"
+            else None
+        )
+        self._backend = backend if backend is not None else SubprocessBackend()
+        self._persistent_shell = persistent_shell
+        self._shell: subprocess.Popen[bytes] | None = None
+        self._shell_lines: queue.Queue[bytes | None] = queue.Queue()
+        self._shell_lock = threading.Lock()
+        # Bumped by every command that may change the screen; a cached
+        # screenshot is reused only while the epoch it was taken in holds.
+        self._screen_epoch = 0
+        self._screen_cache: tuple[int, bytes] | None = None
+        # Scripts written by compile_sequence during this session
+        self._uploaded_scripts: set[str] = set()
+
+    def close(self) -> None:
+        """End the persistent shell session, if one is running."""
+        with self._shell_lock:
+            self._stop_shell()
+
+    def invalidate_cache(self) -> None:
+        """Forget cached device info and the cached screenshot."""
+        super().invalidate_cache()
+        self._screen_cache = None
+
+    def __enter__(self) -> "AdbController":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
 
     # ------------------------------------------------------------------ #
     # Internal helpers
     # ------------------------------------------------------------------ #
 
-    def _base_cmd(self) -> list[str]:
-        """Return the base command prefix (adb or adb -s <serial>)."""
-        if self._device_serial:
-            return [self._adb_path, "-s", self._device_serial]
-        return [self._adb_path]
+    def _start_shell(self) -> subprocess.Popen[bytes]:
+        """Spawn the persistent ``adb shell`` and its stdout reader thread."""
+        proc = subprocess.Popen(
+            self._build_cmd(["shell"]),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=0,
+            cwd=self._cwd,
+            **_SPAWN_KWARGS,
+        )
+        self._shell_lines = queue.Queue()
+        threading.Thread(
+            target=_pump_lines,
+            args=(proc.stdout, self._shell_lines),
+            name="adb-shell-reader",
+            daemon=True,
+        ).start()
+        self._shell = proc
+        return proc
+
+    def _stop_shell(self) -> None:
+        """Terminate the persistent shell. Caller must hold ``_shell_lock``."""
+        proc, self._shell = self._shell, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.write(b"exit\n")
+            proc.stdin.flush()
+            proc.wait(timeout=1.0)
+        except (OSError, subprocess.TimeoutExpired):
+            proc.kill()
+
+    def _shell_exec(self, cmdline: str) -> tuple[int, str]:
+        """Run *cmdline* in the persistent shell and return (exit code, output).
+
+        The command runs in a child ``sh -c`` with stdin from /dev/null, so
+        it cannot exit the session, leak ``cd``/variable state, or swallow
+        later commands, and a syntax error (e.g. an unbalanced quote) fails
+        in the child instead of leaving the session waiting for more input.
+        Its stdout and stderr are read until the marker line that carries
+        its exit status.
+        """
+        cmd = self._build_cmd(["shell", cmdline])
+        with self._shell_lock:
+            proc = self._shell
+            if proc is None or proc.poll() is not None:
+                proc = self._start_shell()
+            try:
+                proc.stdin.write(
+                    f"sh -c {shlex.quote(cmdline)} </dev/null; "
+                    f"echo {_SHELL_MARKER.decode()}$?\n".encode()
+                )
+                proc.stdin.flush()
+            except OSError as exc:
+                self._stop_shell()
+                raise AdbError(f"adb shell session is not writable: {exc}") from exc
+
+            deadline = None if self._timeout_s is None else time.monotonic() + self._timeout_s
+            output = bytearray()
+            while True:
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    line = self._shell_lines.get(timeout=remaining)
+                except queue.Empty:
+                    self._stop_shell()
+                    raise self._timeout_error(cmd) from None
+                if line is None:
+                    self._shell = None
+                    raise AdbError(
+                        f"adb shell session ended unexpectedly: {' '.join(cmd)}",
+                        stdout=output.decode(errors="replace"),
+                    )
+                idx = line.find(_SHELL_MARKER)
+                if idx < 0:
+                    output += line
+                    continue
+                output += line[:idx]
+                returncode = int(line[idx + len(_SHELL_MARKER):].strip() or 0)
+                return returncode, output.decode(errors="replace")
+
+    def _socket_exec(self, cmd: Sequence[str], cmdline: str) -> tuple[int, str]:
+        """Run *cmdline* through the adb server socket, starting the server if needed."""
+        assert self._socket is not None
+        try:
+            try:
+                return self._socket.shell(cmdline)
+            except ConnectionRefusedError:
+                # No server listening yet; start one and retry once.
+                self.start_server()
+                return self._socket.shell(cmdline)
+        except TimeoutError as exc:
+            raise self._timeout_error(cmd) from exc
+        except OSError as exc:
+            raise AdbError(f"adb server request failed: {' '.join(cmd)}: {exc}") from exc
 
     def _run(
         self,
         args: Sequence[str],
         *,
         check: bool = True,
-        capture_output: bool = True,
-        text: bool = True,
-    ) -> subprocess.CompletedProcess[str]:
+        binary: bool = False,
+        stdout: IO[bytes] | None = None,
+        read_only: bool = False,
+    ) -> subprocess.CompletedProcess:
         """Run an ADB command via subprocess.
 
+        Output is decoded as text unless *binary* is True, in which case
+        stdout and stderr are returned as raw bytes. If *stdout* is given
+        (a binary file), the command's output is streamed into it instead
+        of being captured. Unless *read_only* is True, the command is
+        assumed to change the screen and the screenshot cache is retired.
+
         Raises
         ------
         AdbError
             If check is True and the command returns a non-zero exit code.
         """
-        cmd = [*self._base_cmd(), *args]
-        try:
-            result = subprocess.run(
-                cmd,
-                check=False,
-                capture_output=capture_output,
-                text=text,
-                timeout=self._timeout_s,
-                cwd=self._cwd,
+        if not read_only:
+            self._screen_epoch += 1
+        if (
+            (self._persistent_shell or self._socket is not None)
+            and not binary
+            and args
+            and args[0] == "shell"
+        ):
+            # adb itself joins shell arguments with spaces, so this matches
+            # what a one-shot `adb shell ...` would have executed.
+            cmdline = " ".join(args[1:])
+            cmd = self._build_cmd(args)
+            returncode, stdout = (
+                self._socket_exec(cmd, cmdline)
+                if self._socket is not None
+                else self._shell_exec(cmdline)
             )
-        except subprocess.TimeoutExpired as exc:
-            raise AdbError(
-                f"Command timed out after {self._timeout_s}s: {' '.join(cmd)}"
-            ) from exc
+            if check and returncode != 0:
+                raise self._command_error(cmd, returncode, stdout, "")
+            return subprocess.CompletedProcess(cmd, returncode, stdout, "")
+
+        cmd = self._build_cmd(args)
+        result = self._spawn(cmd, binary=binary, stdout=stdout)
+        if result.returncode != 0 and _daemon_unreachable(result.stderr):
+            # The server died or never came up; restart it and retry once.
+            self.start_server()
+            if stdout is not None:
+                stdout.seek(0)
+                stdout.truncate()
+            result = self._spawn(cmd, binary=binary, stdout=stdout)
 
         if check and result.returncode != 0:
-            raise AdbError(
-                f"ADB command failed (exit {result.returncode}): {' '.join(cmd)}\n"
-                f"stdout: {result.stdout}\nstderr: {result.stderr}",
-                returncode=result.returncode,
-                stdout=result.stdout,
-                stderr=result.stderr,
-            )
+            if binary:
+                raise self._command_error(
+                    cmd, result.returncode, None, result.stderr.decode(errors="replace")
+                )
+            raise self._command_error(cmd, result.returncode, result.stdout, result.stderr)
         return result
 
-    def _run_bytes(
+    def _spawn(
         self,
-        args: Sequence[str],
+        cmd: Sequence[str],
         *,
-        check: bool = True,
-    ) -> subprocess.CompletedProcess[bytes]:
-        """Run an ADB command and capture binary output."""
-        cmd = [*self._base_cmd(), *args]
+        binary: bool = False,
+        stdout: IO[bytes] | None = None,
+    ) -> subprocess.CompletedProcess:
+        """Run *cmd* once on the backend, honouring ``timeout_s``."""
         try:
-            result = subprocess.run(
+            return self._backend.run(
                 cmd,
-                check=False,
-                capture_output=True,
-                text=False,
+                binary=binary,
+                stdout=stdout,
                 timeout=self._timeout_s,
                 cwd=self._cwd,
+                **_SPAWN_KWARGS,
             )
         except subprocess.TimeoutExpired as exc:
-            raise AdbError(
-                f"Command timed out after {self._timeout_s}s: {' '.join(cmd)}"
-            ) from exc
+            raise self._timeout_error(cmd) from exc
 
-        if check and result.returncode != 0:
-            raise AdbError(
-                f"ADB command failed (exit {result.returncode}): {' '.join(cmd)}\n"
-                f"stderr: {result.stderr.decode(errors='replace')}",
-                returncode=result.returncode,
-                stdout=None,
-                stderr=result.stderr.decode(errors="replace"),
-            )
-        return result
+    def _dump_ui_xml(self) -> bytes:
+        """Stream the UI hierarchy straight back and return the XML bytes."""
+        # Dumping to /dev/tty over exec-out avoids a second `cat` round-trip
+        # and the on-device file write.
+        result = self._run(
+            ["exec-out", "uiautomator", "dump", "/dev/tty"], binary=True, read_only=True
+        )
+        return _strip_dump_banner(result.stdout)
 
     # ------------------------------------------------------------------ #
     # Public API
     # ------------------------------------------------------------------ #
 
+    def start_server(self) -> str:
+        """Start the adb server if it is not already running.
+
+        adb starts the server on demand, so this is only needed to pay the
+        start-up cost up front. Commands that fail because the server is
+        unreachable call it automatically and retry once.
+
+        Returns
+        -------
+        str
+            Confirmation message.
+
+        Raises
+        ------
+        AdbError
+            If the server cannot be started.
+        """
+        cmd = [self._adb_path, "start-server"]
+        result = self._spawn(cmd)
+        if result.returncode != 0:
+            raise self._command_error(cmd, result.returncode, result.stdout, result.stderr)
+        return "ADB server running"
+
+    def capture_screenshot_bytes(self, *, cached: bool = False) -> bytes:
+        """Capture the device screen and return the PNG bytes without touching disk.
+
+        Parameters
+        ----------
+        cached
+            Reuse the last screenshot taken with ``cached=True`` if this
+            controller has sent nothing that may change the screen since:
+            no tap, text, key event, app launch, ... and no
+            :meth:`wait_for_idle`. Off by default, because the screen can
+            also change on its own (animations, loading). :meth:`wait` is a
+            plain sleep and does not know the device, so call
+            :meth:`invalidate_cache` after waiting for the UI to update.
+
+        Returns
+        -------
+        bytes
+            The raw ``screencap -p`` output.
+
+        Raises
+        ------
+        AdbError
+            If the capture fails.
+        """
+        epoch = self._screen_epoch
+        hit = self._screen_cache
+        if cached and hit is not None and hit[0] == epoch:
+            return hit[1]
+        png = self._run(["exec-out", "screencap", "-p"], binary=True, read_only=True).stdout
+        if cached:
+            self._screen_cache = (epoch, png)
+        return png
+
     def take_screenshot(self, output_path: str | Path = "screenshot.png") -> str:
         """Capture the device screen and save it to *output_path*.
 
@@ -158,10 +832,23 @@ class AdbController:
         -------
         str
             Confirmation message including the saved path.
+
+        Raises
+        ------
+        AdbError
+            If the capture fails; no partial file is left at *output_path*.
         """
-        result = self._run_bytes(["exec-out", "screencap", "-p"])
         path = Path(output_path)
-        path.write_bytes(result.stdout)
+        # Stream the PNG straight into the file rather than buffering it here.
+        try:
+            with path.open("wb") as fh:
+                self._run(
+                    ["exec-out", "screencap", "-p"], binary=True, stdout=fh, read_only=True
+                )
+        except AdbError:
+            # Don't leave a truncated PNG behind for the LLM to read.
+            path.unlink(missing_ok=True)
+            raise
         return f"Saved screenshot to {path}"
 
     def tap_coordinates(self, x: int, y: int) -> str:
@@ -198,13 +885,7 @@ class AdbController:
         str
             Confirmation message.
         """
-        # ADB `input text` requires spaces to be encoded as %s
-        encoded = text.replace(" ", "%s")
-        # Escape shell metacharacters that could cause issues.
-        # Backslashes must be escaped first to avoid double-escaping.
-        encoded = encoded.replace("\\", "\\\\")
-        for char in ("'", '"', "`", "$", "(", ")", "&", "|", ";", "<", ">"):
-            encoded = encoded.replace(char, f"\\{char}")
+        encoded = escape_input_text(text)
         self._run(["shell", "input", "text", encoded])
         return f"Typed text: {text!r}"
 
@@ -284,6 +965,10 @@ class AdbController:
     def is_package_installed(self, package: str) -> bool:
         """Check if a package is installed on the device.
 
+        The full package list is fetched once and cached; call
+        :meth:`invalidate_cache` after installing or removing apps
+        outside this controller.
+
         Parameters
         ----------
         package
@@ -294,8 +979,13 @@ class AdbController:
         bool
             True if installed, False otherwise.
         """
-        result = self._run(["shell", "pm", "list", "packages", package], check=False)
-        return f"package:{package}" in result.stdout
+        if self._packages is None:
+            result = self._run(["shell", "pm", "list", "packages"], check=False, read_only=True)
+            packages = _parse_packages(result.stdout)
+            if result.returncode != 0:
+                return package in packages  # don't cache a partial listing
+            self._packages = packages
+        return package in self._packages
 
     # ------------------------------------------------------------------ #
     # Screen / input helpers
@@ -304,20 +994,18 @@ class AdbController:
     def get_screen_size(self) -> tuple[int, int]:
         """Get the device screen resolution.
 
+        The result is cached for the lifetime of the controller; call
+        :meth:`invalidate_cache` after an orientation change.
+
         Returns
         -------
         tuple[int, int]
             (width, height) in pixels.
         """
-        result = self._run(["shell", "wm", "size"])
-        # Output format: "Physical size: 1080x1920"
-        for line in result.stdout.strip().splitlines():
-            if ":" in line:
-                size_str = line.split(":")[-1].strip()
-                if "x" in size_str:
-                    w, h = size_str.split("x")
-                    return int(w), int(h)
-        raise AdbError(f"Could not parse screen size from: {result.stdout}")
+        if self._screen_size is None:
+            result = self._run(["shell", "wm", "size"], read_only=True)
+            self._screen_size = _parse_screen_size(result.stdout)
+        return self._screen_size
 
     def swipe(
         self,
@@ -349,6 +1037,167 @@ class AdbController:
         ])
         return f"Swiped from ({x1}, {y1}) to ({x2}, {y2}) in {duration_ms}ms"
 
+    def run_gesture(self, points: Sequence[tuple[int, int, int]]) -> str:
+        """Perform a single-finger gesture through the given points.
+
+        The finger goes down on the first point, moves through the rest,
+        and lifts after the last one. The whole gesture is written as raw
+        ``sendevent`` calls and sent in one ``adb shell`` round-trip, so
+        it avoids starting the on-device ``input`` tool once per segment.
+
+        Parameters
+        ----------
+        points
+            Sequence of ``(x, y, hold_ms)`` tuples in screen pixels. The
+            finger rests on each point for *hold_ms* before moving on.
+
+        Returns
+        -------
+        str
+            Confirmation message.
+
+        Raises
+        ------
+        AdbError
+            If *points* is empty or no touchscreen input device is found.
+        """
+        if not points:
+            raise AdbError("Gesture requires at least one point")
+
+        if self._touch_device is None:
+            result = self._run(["shell", "getevent", "-pl"], read_only=True)
+            self._touch_device = _parse_touch_device(result.stdout)
+            if self._touch_device is None:
+                raise AdbError("No multi-touch input device found")
+        device, max_x, max_y = self._touch_device
+        width, height = self.get_screen_size()
+
+        def event(ev_type: int, code: int, value: int) -> str:
+            return f"sendevent {device} {ev_type} {code} {value}"
+
+        script = [
+            event(_EV_ABS, _ABS_MT_TRACKING_ID, 0),
+            event(_EV_KEY, _BTN_TOUCH, 1),
+        ]
+        for x, y, hold_ms in points:
+            script.append(event(_EV_ABS, _ABS_MT_POSITION_X, x * max_x // width))
+            script.append(event(_EV_ABS, _ABS_MT_POSITION_Y, y * max_y // height))
+            script.append(event(_EV_SYN, 0, 0))
+            if hold_ms > 0:
+                script.append(_sleep_command(hold_ms / 1000))
+        script += [
+            event(_EV_ABS, _ABS_MT_TRACKING_ID, -1),
+            event(_EV_KEY, _BTN_TOUCH, 0),
+            event(_EV_SYN, 0, 0),
+        ]
+
+        self._run(["shell", " && ".join(script)])
+        return f"Performed gesture through {len(points)} point(s)"
+
+    def batch_tap(self, coords: Sequence[tuple[int, int]]) -> str:
+        """Tap several points in order with a single adb round-trip.
+
+        The taps are chained in one ``adb shell`` command rather than run
+        in parallel, since concurrent ``input`` calls on the same device
+        would land in an unpredictable order.
+
+        Parameters
+        ----------
+        coords
+            Sequence of ``(x, y)`` screen coordinates, tapped in order.
+
+        Returns
+        -------
+        str
+            Confirmation message.
+
+        Raises
+        ------
+        AdbError
+            If *coords* is empty or the command fails.
+        """
+        if not coords:
+            raise AdbError("batch_tap requires at least one point")
+        self._run(["shell", " && ".join(f"input tap {x} {y}" for x, y in coords)])
+        return f"Tapped {len(coords)} point(s)"
+
+    def execute_batch(self, shell_cmds: Sequence[str], *, stop_on_error: bool = True) -> str:
+        """Run several shell commands in one ``adb shell`` invocation.
+
+        Parameters
+        ----------
+        shell_cmds
+            Commands as they would follow ``adb shell``, e.g.
+            ``"input tap 540 1080"``.
+        stop_on_error
+            If True, commands are chained with ``&&`` and the batch stops at
+            the first failure. Otherwise they are joined with ``;`` and the
+            exit code is that of the last command.
+
+        Returns
+        -------
+        str
+            Confirmation message.
+
+        Raises
+        ------
+        AdbError
+            If *shell_cmds* is empty or the batch exits non-zero.
+        """
+        if not shell_cmds:
+            raise AdbError("execute_batch requires at least one command")
+        joined = (" && " if stop_on_error else "; ").join(shell_cmds)
+        self._run(["shell", joined])
+        return f"Ran {len(shell_cmds)} command(s) in one batch"
+
+    def compile_sequence(self, commands: Sequence[str]) -> CompiledSequence:
+        """Store a fixed command sequence on the device as a shell script.
+
+        The script is named after a hash of its contents, so replaying the
+        same sequence reuses the file already on the device. Each
+        :meth:`CompiledSequence.run` then costs a single round-trip,
+        however long the sequence is.
+
+        Each command is followed by ``|| exit $?``, so the script stops
+        with that command's status as soon as one fails, even inside an
+        ``&&`` chain (which ``set -e`` would not stop). The file is written
+        to a temporary name and moved into place, so an interrupted upload
+        never leaves a partial script behind.
+
+        Parameters
+        ----------
+        commands
+            Shell commands as they would follow ``adb shell``, e.g.
+            ``"input tap 540 1200"``.
+
+        Returns
+        -------
+        CompiledSequence
+            Handle used to run the sequence.
+
+        Raises
+        ------
+        AdbError
+            If *commands* is empty or the script cannot be written.
+        """
+        if not commands:
+            raise AdbError("compile_sequence requires at least one command")
+        # The newline before "}" keeps a trailing comment from eating it
+        lines = [f"{{ {cmd}\n}} || exit $?" for cmd in commands]
+        digest = hashlib.sha1("\n".join(lines).encode()).hexdigest()[:12]
+        path = f"/data/local/tmp/qg_seq_{digest}.sh"
+
+        if path not in self._uploaded_scripts:
+            quoted = " ".join(shlex.quote(line) for line in lines)
+            tmp = f"{path}.$$"
+            self._run([
+                "shell",
+                f"[ -f {path} ] || {{ printf '%s\\n' {quoted} > {tmp} && mv {tmp} {path}; }}",
+            ])
+            self._uploaded_scripts.add(path)
+
+        return CompiledSequence(self, path, tuple(commands))
+
     def long_press(self, x: int, y: int, duration_ms: int = 1000) -> str:
         """Perform a long press at the given coordinates.
 
@@ -390,6 +1239,77 @@ class AdbController:
         time.sleep(seconds)
         return f"Waited {seconds}s"
 
+    @staticmethod
+    async def wait_async(seconds: float) -> str:
+        """Wait for *seconds* without blocking the event loop.
+
+        The awaitable counterpart of :meth:`wait`, for callers that want to
+        overlap a UI settle delay with other work, e.g.
+        ``await asyncio.gather(AdbController.wait_async(1.0), plan_next())``.
+
+        Returns
+        -------
+        str
+            Confirmation message.
+        """
+        await asyncio.sleep(seconds)
+        return f"Waited {seconds}s"
+
+    def wait_for_idle(
+        self,
+        package: str,
+        *,
+        timeout_s: float = 5.0,
+        quiet_ms: int = 300,
+        poll_s: float = 0.05,
+    ) -> str:
+        """Wait until *package* stops rendering frames.
+
+        Polls ``dumpsys gfxinfo <package> framestats`` and returns once the
+        latest completed frame has not changed for *quiet_ms*. Unlike
+        :meth:`wait`, this returns as soon as the UI settles instead of
+        always sleeping for a fixed duration.
+
+        Parameters
+        ----------
+        package
+            The package whose frames are observed.
+        timeout_s
+            Maximum time to wait for the UI to settle.
+        quiet_ms
+            How long no new frame may be produced before the UI counts as idle.
+        poll_s
+            Delay between polls.
+
+        Returns
+        -------
+        str
+            Confirmation message. Returns (without raising) if the UI is
+            still rendering when *timeout_s* elapses.
+        """
+        # The UI is expected to change while we wait; retire any cached screenshot.
+        self._screen_epoch += 1
+        start = time.monotonic()
+        deadline = start + timeout_s
+        quiet_s = quiet_ms / 1000.0
+        last_seen: object = object()
+        last_change = start
+
+        while True:
+            result = self._run(
+                ["shell", "dumpsys", "gfxinfo", package, "framestats"], read_only=True
+            )
+            frame_end = _parse_last_frame_end(result.stdout)
+            now = time.monotonic()
+            if frame_end != last_seen:
+                last_seen = frame_end
+                last_change = now
+            elif now - last_change >= quiet_s:
+                return f"UI idle after {now - start:.2f}s"
+            if now >= deadline:
+                return f"UI still busy after {timeout_s}s"
+            time.sleep(poll_s)
+
     def tap_text(self, text: str, *, partial: bool = False) -> str:
         """Find an element by its visible text and tap on it.
 
@@ -413,76 +1333,7 @@ class AdbController:
         AdbError
             If the element is not found or tap fails.
         """
-        import re
-        import xml.etree.ElementTree as ET
-
-        # Dump UI hierarchy to device
-        self._run(["shell", "uiautomator", "dump", "/sdcard/ui_dump.xml"])
-
-        # Pull the dump file
-        result = self._run(["shell", "cat", "/sdcard/ui_dump.xml"])
-        xml_content = result.stdout
-
-        # Parse XML and find element
-        try:
-            root = ET.fromstring(xml_content)
-        except ET.ParseError as exc:
-            raise AdbError(f"Failed to parse UI dump: {exc}")
-
-        # Collect ALL matching elements (includes hint/placeholder text)
-        matches = []
-        for elem in root.iter("node"):
-            elem_text = elem.get("text", "")
-            content_desc = elem.get("content-desc", "")
-            hint = elem.get("hint", "")  # Placeholder text for input fields
-
-            if partial:
-                text_lower = text.lower()
-                if (text_lower in elem_text.lower() or 
-                    text_lower in content_desc.lower() or
-                    text_lower in hint.lower()):
-                    matches.append(elem)
-            else:
-                if elem_text == text or content_desc == text or hint == text:
-                    matches.append(elem)
-
-        if not matches:
-            raise AdbError(f"Element with text '{text}' not found on screen")
-
-        # Prefer interactive elements (buttons, inputs) over static text
-        def element_priority(elem: ET.Element) -> int:
-            """Higher score = better match for tapping."""
-            score = 0
-            # Clickable elements are highest priority
-            if elem.get("clickable") == "true":
-                score += 100
-            # Check element class for interactive types
-            elem_class = elem.get("class", "")
-            if "Button" in elem_class:
-                score += 50
-            if "EditText" in elem_class or "Input" in elem_class:
-                score += 50
-            if "CheckBox" in elem_class or "Switch" in elem_class or "Radio" in elem_class:
-                score += 40
-            # Focusable elements are somewhat interactive
-            if elem.get("focusable") == "true":
-                score += 10
-            return score
-
-        # Sort by priority (highest first) and pick the best match
-        matches.sort(key=element_priority, reverse=True)
-        found_element = matches[0]
-
-        # Extract bounds and calculate center
-        bounds_str = found_element.get("bounds", "")
-        # bounds format: "[left,top][right,bottom]"
-        match = re.match(r"\[(\d+),(\d+)\]\[(\d+),(\d+)\]", bounds_str)
-        if not match:
-            raise AdbError(f"Could not parse bounds: {bounds_str}")
-
-        left, top, right, bottom = map(int, match.groups())
-        center_x = (left + right) // 2
-        center_y = (top + bottom) // 2
+        center_x, center_y = _find_text_center(self._dump_ui_xml(), text, partial)
 
         # Tap the center of the element
         self._run(["shell", "input", "tap", str(center_x), str(center_y)])
@@ -522,27 +1373,30 @@ class AdbController:
         AdbError
             If the element is not found or actions fail.
         """
-        import time
-
-        # First tap on the target element to focus it
-        tap_result = self.tap_text(target_text, partial=partial)
-
-        # Small delay to let the keyboard appear and field focus
-        time.sleep(delay_ms / 1000.0)
-
-        # Clear existing text by moving to end and deleting backwards
-        # This is more reliable than Ctrl+A on Android
-        self._run(["shell", "input", "keyevent", "123"])  # KEYCODE_MOVE_END
-        time.sleep(0.05)
-        # Delete existing text - send multiple DEL key events in one command
-        # 30 KEYCODE_DEL (67) events to clear typical field content
-        self._run(["shell", "input", "keyevent"] + ["67"] * 30)
-        time.sleep(0.15)
-
-        # Now type the new text
-        type_result = self.type_text(input_text)
-
-        return f"{tap_result}; Cleared existing text; {type_result}"
+        target = _find_text_element(self._dump_ui_xml(), target_text, partial)
+        center_x, center_y = _element_center(target)
+        delete_count = _clear_count(target)
+
+        # Tap, wait for focus, clear and type in a single adb round-trip.
+        # Clearing moves to the end and deletes backwards, which is more
+        # reliable than Ctrl+A on Android. When the target is an input field,
+        # the dump already tells us how many characters it holds; otherwise
+        # fall back to a fixed number of DEL presses.
+        steps = [
+            f"input tap {center_x} {center_y}",
+            _sleep_command(delay_ms / 1000),  # let the keyboard appear and field focus
+            "input keyevent 123",  # KEYCODE_MOVE_END
+        ]
+        if delete_count:
+            steps.append("input keyevent " + " ".join(["67"] * delete_count))  # KEYCODE_DEL
+        if input_text:
+            steps.append(f"input text {escape_input_text(input_text)}")
+        self._run(["shell", " && ".join(steps)])
+
+        return (
+            f"Tapped on element with text '{target_text}' at ({center_x}, {center_y}); "
+            f"Cleared existing text; Typed text: {input_text!r}"
+        )
 
     def dump_ui_texts(self) -> list[str]:
         """Extract all visible text labels from the current screen.
@@ -555,34 +1409,7 @@ class AdbController:
         list[str]
             List of visible text labels (text, content-desc, and hint values).
         """
-        import xml.etree.ElementTree as ET
-
-        # Dump UI hierarchy to device
-        self._run(["shell", "uiautomator", "dump", "/sdcard/ui_dump.xml"])
-
-        # Pull the dump file
-        result = self._run(["shell", "cat", "/sdcard/ui_dump.xml"])
-        xml_content = result.stdout
-
-        # Parse XML and extract texts
-        texts: list[str] = []
-        try:
-            root = ET.fromstring(xml_content)
-            for elem in root.iter("node"):
-                elem_text = elem.get("text", "").strip()
-                content_desc = elem.get("content-desc", "").strip()
-                hint = elem.get("hint", "").strip()
-                if elem_text:
-                    texts.append(elem_text)
-                if content_desc and content_desc != elem_text:
-                    texts.append(content_desc)
-                # Include hint (placeholder text) for input fields
-                if hint and hint != elem_text and hint != content_desc:
-                    texts.append(hint)
-        except ET.ParseError:
-            pass  # Return empty list on parse failure
-
-        return texts
+        return _parse_ui_texts(self._dump_ui_xml())
 
     def exists_text(self, text: str, *, partial: bool = False) -> bool:
         """Check if text exists on the current screen.
@@ -599,11 +1426,7 @@ class AdbController:
         bool
             True if text is found, False otherwise.
         """
-        ui_texts = self.dump_ui_texts()
-        if partial:
-            text_lower = text.lower()
-            return any(text_lower in t.lower() for t in ui_texts)
-        return text in ui_texts
+        return _contains_text(_iter_attr_values(self._dump_ui_xml()), text, partial)
 
     def scroll_until_text(
         self,
@@ -636,33 +1459,17 @@ class AdbController:
         AdbError
             If text is not found after max_swipes.
         """
-        # Get screen dimensions for scroll calculations
-        width, height = self.get_screen_size()
-        cx, cy = width // 2, height // 2
-
-        # Define swipe vectors based on direction
-        swipe_map = {
-            "down": (cx, int(height * 0.7), cx, int(height * 0.3)),
-            "up": (cx, int(height * 0.3), cx, int(height * 0.7)),
-            "left": (int(width * 0.7), cy, int(width * 0.3), cy),
-            "right": (int(width * 0.3), cy, int(width * 0.7), cy),
-        }
-
-        if direction not in swipe_map:
-            raise AdbError(f"Invalid scroll direction: {direction}")
+        if self.exists_text(text, partial=partial):
+            return f"Found text '{text}' after 0 scroll(s)"
 
-        x1, y1, x2, y2 = swipe_map[direction]
-
-        for attempt in range(max_swipes):
-            if self.exists_text(text, partial=partial):
-                return f"Found text '{text}' after {attempt} scroll(s)"
+        x1, y1, x2, y2 = _scroll_vector(*self.get_screen_size(), direction)
 
+        for attempt in range(1, max_swipes + 1):
             self.swipe(x1, y1, x2, y2, 300)
             self.wait(0.5)
 
-        # Final check after last swipe
-        if self.exists_text(text, partial=partial):
-            return f"Found text '{text}' after {max_swipes} scroll(s)"
+            if self.exists_text(text, partial=partial):
+                return f"Found text '{text}' after {attempt} scroll(s)"
 
         raise AdbError(f"Text '{text}' not found after {max_swipes} scroll(s) {direction}")
 
@@ -699,9 +1506,11 @@ class AdbController:
         str
             Confirmation message.
         """
-        self.force_stop(package)
-        self.wait(0.5)
-        self.launch_app(package)
+        self._run([
+            "shell",
+            f"am force-stop {package} && sleep 0.5 && "
+            f"monkey -p {package} -c android.intent.category.LAUNCHER 1",
+        ])
         return f"Relaunched app: {package}"
 
     def get_current_activity(self) -> str:
@@ -712,14 +1521,5 @@ class AdbController:
         str
             The current activity name (e.g., "com.example/.MainActivity").
         """
-        result = self._run(["shell", "dumpsys", "activity", "activities"])
-        # Parse the output to find the focused activity
-        for line in result.stdout.splitlines():
-            if "mResumedActivity" in line or "mFocusedActivity" in line:
-                # Extract activity name from the line
-                parts = line.split()
-                for part in parts:
-                    if "/" in part and "." in part:
-                        return part.strip()
-        return ""
-
+        result = self._run(["shell", "dumpsys", "activity", "activities"], read_only=True)
+        return _parse_current_activity(result.stdout)
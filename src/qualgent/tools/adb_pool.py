@@ -0,0 +1,130 @@
+"""Thread pool for running the same ADB action on several devices."""
+
+from __future__ import annotations
+
+import functools
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any
+
+from qualgent.tools.adb_controller import AdbController, AdbError
+
+if TYPE_CHECKING:
+    from typing import Sequence
+
+__all__ = ["AdbControllerPool"]
+
+
+class AdbControllerPool:
+    """Dispatches identical AdbController calls across devices concurrently.
+
+    Each call runs on its own worker thread. The threads spend nearly all
+    their time blocked in ``subprocess`` waits, which release the GIL, so
+    fan-out scales with the number of devices.
+
+    Any public AdbController method can also be called on the pool
+    directly; ``pool.tap_coordinates(100, 200)`` is shorthand for
+    ``pool.map("tap_coordinates", 100, 200)``.
+
+    Parameters
+    ----------
+    controllers
+        One controller per target device.
+    """
+
+    def __init__(self, controllers: Sequence[AdbController]) -> None:
+        if not controllers:
+            raise ValueError("AdbControllerPool requires at least one controller")
+        self._controllers = list(controllers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(self._controllers),
+            thread_name_prefix="adb-pool",
+        )
+        self._owns_controllers = False
+
+    @classmethod
+    def from_serials(cls, serials: Sequence[str], **kwargs: Any) -> "AdbControllerPool":
+        """Build a pool with one new AdbController per device serial.
+
+        Parameters
+        ----------
+        serials
+            Device/emulator serials, in dispatch order.
+        **kwargs
+            Passed to every :class:`AdbController` (e.g. ``timeout_s``).
+
+        Returns
+        -------
+        AdbControllerPool
+            A pool that also closes its controllers on :meth:`close`.
+        """
+        pool = cls([AdbController(device_serial=s, **kwargs) for s in serials])
+        pool._owns_controllers = True
+        return pool
+
+    @property
+    def controllers(self) -> list[AdbController]:
+        """The pooled controllers, in dispatch order."""
+        return list(self._controllers)
+
+    def map(
+        self,
+        method_name: str,
+        *args: Any,
+        deadline_s: float | None = None,
+        **kwargs: Any,
+    ) -> list[Any]:
+        """Call ``method_name(*args, **kwargs)`` on every controller at once.
+
+        Parameters
+        ----------
+        method_name
+            Name of the AdbController method to call (e.g. ``"tap_coordinates"``).
+        *args, **kwargs
+            Arguments passed unchanged to each call.
+        deadline_s
+            Shared deadline for all devices. ``None`` waits indefinitely.
+            Named so that a ``timeout_s`` keyword (as taken by
+            :meth:`AdbController.wait_for_idle`) reaches the method itself.
+
+        Returns
+        -------
+        list
+            One result per controller, in the same order as :attr:`controllers`.
+
+        Raises
+        ------
+        AdbError
+            If any device has not finished within *deadline_s*, or re-raised
+            from the first device (in order) whose call failed.
+        """
+        futures = [
+            self._executor.submit(getattr(ctrl, method_name), *args, **kwargs)
+            for ctrl in self._controllers
+        ]
+        _, not_done = wait(futures, timeout=deadline_s)
+        if not_done:
+            for future in not_done:
+                future.cancel()
+            raise AdbError(
+                f"{method_name} timed out after {deadline_s}s on "
+                f"{len(not_done)} of {len(futures)} device(s)"
+            )
+        return [future.result() for future in futures]
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") or not callable(getattr(AdbController, name, None)):
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        return functools.partial(self.map, name)
+
+    def close(self) -> None:
+        """Shut down the worker threads (and controllers built by :meth:`from_serials`)."""
+        self._executor.shutdown(wait=True)
+        if self._owns_controllers:
+            for ctrl in self._controllers:
+                ctrl.close()
+
+    def __enter__(self) -> "AdbControllerPool":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
@@ -0,0 +1,119 @@
+"""Minimal client for the adb server's smart-socket protocol.
+
+Lets :class:`~qualgent.tools.adb_controller.AdbController` run shell
+commands by talking to the local adb server (``127.0.0.1:5037``) directly
+instead of forking the ``adb`` client binary for every call.
+
+Each request is a 4-hex-digit length followed by the service name; the
+server answers ``OKAY`` or ``FAIL`` plus a length-prefixed message. A
+``shell:`` service then streams the command's output until it closes the
+connection, so every command uses one short-lived local TCP connection.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+
+__all__ = ["AdbServerError", "AdbSocketClient"]
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 5037
+
+# Printed after each command with its exit status appended
+_STATUS_MARKER = b"__QGSOCK__"
+
+
+class AdbServerError(ConnectionError):
+    """Raised when the adb server rejects a request (``FAIL`` response)."""
+
+
+class AdbSocketClient:
+    """Runs shell commands on one device through the adb server socket.
+
+    Parameters
+    ----------
+    device_serial
+        Serial of the target device. ``None`` selects the only connected
+        device, like ``adb`` without ``-s``.
+    host, port
+        Address of the adb server. *port* defaults to
+        ``$ANDROID_ADB_SERVER_PORT``, as for the adb client, else 5037.
+    timeout_s
+        Socket timeout in seconds for connecting and for each read.
+        ``None`` means no timeout.
+    """
+
+    def __init__(
+        self,
+        device_serial: str | None = None,
+        *,
+        host: str = DEFAULT_HOST,
+        port: int | None = None,
+        timeout_s: float | None = None,
+    ) -> None:
+        self._transport = (
+            f"host:transport:{device_serial}" if device_serial else "host:transport-any"
+        )
+        if port is None:
+            port = int(os.environ.get("ANDROID_ADB_SERVER_PORT", DEFAULT_PORT))
+        self._address = (host, port)
+        self._timeout_s = timeout_s
+
+    def shell(self, cmdline: str) -> tuple[int, str]:
+        """Run *cmdline* in a device shell and return (exit code, output).
+
+        Stdout and stderr are interleaved in the output, as with a
+        non-PTY ``adb shell``.
+
+        Raises
+        ------
+        OSError
+            If the server is unreachable (``ConnectionRefusedError``), the
+            request times out (``TimeoutError``), or the server rejects it
+            (:class:`AdbServerError`).
+        """
+        script = f"( {cmdline}\n) </dev/null; echo {_STATUS_MARKER.decode()}$?"
+        with socket.create_connection(self._address, timeout=self._timeout_s) as sock:
+            self._request(sock, self._transport)
+            self._request(sock, f"shell:{script}")
+            output = _read_to_eof(sock)
+
+        idx = output.rfind(_STATUS_MARKER)
+        if idx < 0:
+            raise AdbServerError("adb shell closed before reporting an exit status")
+        returncode = int(output[idx + len(_STATUS_MARKER):].strip() or 0)
+        return returncode, output[:idx].decode(errors="replace")
+
+    @staticmethod
+    def _request(sock: socket.socket, service: str) -> None:
+        """Send one length-prefixed request and wait for ``OKAY``."""
+        payload = service.encode()
+        sock.sendall(b"%04x" % len(payload) + payload)
+        status = _read_exact(sock, 4)
+        if status == b"OKAY":
+            return
+        if status == b"FAIL":
+            length = int(_read_exact(sock, 4), 16)
+            message = _read_exact(sock, length).decode(errors="replace")
+            raise AdbServerError(f"adb server refused request: {message}")
+        raise AdbServerError(f"unexpected adb server response: {status!r}")
+
+
+def _read_exact(sock: socket.socket, n: int) -> bytes:
+    """Read exactly *n* bytes from *sock*."""
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise AdbServerError("adb server closed the connection")
+        buf += chunk
+    return bytes(buf)
+
+
+def _read_to_eof(sock: socket.socket) -> bytes:
+    """Read from *sock* until the peer closes it."""
+    chunks: list[bytes] = []
+    while chunk := sock.recv(65536):
+        chunks.append(chunk)
+    return b"".join(chunks)
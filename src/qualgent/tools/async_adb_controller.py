@@ -0,0 +1,380 @@
+"""Async ADB controller built on asyncio subprocesses.
+
+Provides the device actions of
+:class:`~qualgent.tools.adb_controller.AdbController` as coroutines so that
+a single event loop can drive many devices concurrently, e.g.::
+
+    await asyncio.gather(*(ctrl.tap_coordinates(x, y) for ctrl in controllers))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import subprocess
+import time
+from pathlib import Path
+from typing import IO, TYPE_CHECKING
+
+from qualgent.tools.adb_controller import (
+    _SPAWN_KWARGS,
+    AdbError,
+    _BaseAdbController,
+    _clear_count,
+    _contains_text,
+    _daemon_unreachable,
+    _element_center,
+    _find_text_center,
+    _find_text_element,
+    _iter_attr_values,
+    _parse_current_activity,
+    _parse_last_frame_end,
+    _parse_packages,
+    _parse_screen_size,
+    _parse_ui_texts,
+    _scroll_vector,
+    _sleep_command,
+    _strip_dump_banner,
+    escape_input_text,
+)
+
+if TYPE_CHECKING:
+    from typing import Sequence
+
+__all__ = ["AsyncAdbController"]
+
+
+class AsyncAdbController(_BaseAdbController):
+    """Async counterpart of :class:`~qualgent.tools.adb_controller.AdbController`.
+
+    Each public method is a coroutine with the same parameters and return
+    values as its sync twin. ``run_gesture`` and ``compile_sequence`` are
+    sync-only, and :meth:`wait` is itself a coroutine, so there is no
+    ``wait_async``. Commands are spawned with
+    :func:`asyncio.create_subprocess_exec`, so awaiting one device never
+    blocks another.
+
+    Parameters
+    ----------
+    device_serial
+        Optional device/emulator serial. When provided, all commands
+        are prefixed with ``adb -s <serial>``.
+    adb_path
+        Path or name of the adb executable. Defaults to ``"adb"``.
+    timeout_s
+        Timeout in seconds for each subprocess call. ``None`` means no timeout.
+    cwd
+        Working directory for subprocess calls. ``None`` uses the current directory.
+    """
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers
+    # ------------------------------------------------------------------ #
+
+    async def _exec(
+        self, args: Sequence[str], *, stdout: IO[bytes] | None = None
+    ) -> tuple[list[str], int, bytes, bytes]:
+        """Run an ADB command, restarting the adb server once if it is unreachable.
+
+        If *stdout* is given, output is streamed into it and ``b""`` is returned.
+        """
+        cmd = self._build_cmd(args)
+        returncode, out, err = await self._spawn(cmd, stdout=stdout)
+        if returncode != 0 and _daemon_unreachable(err):
+            await self.start_server()
+            if stdout is not None:
+                stdout.seek(0)
+                stdout.truncate()
+            returncode, out, err = await self._spawn(cmd, stdout=stdout)
+        return cmd, returncode, out, err
+
+    async def _spawn(
+        self, cmd: Sequence[str], *, stdout: IO[bytes] | None = None
+    ) -> tuple[int, bytes, bytes]:
+        """Spawn *cmd* and wait for it, honouring ``timeout_s``."""
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE if stdout is None else stdout,
+            stderr=subprocess.PIPE,
+            cwd=self._cwd,
+            **_SPAWN_KWARGS,
+        )
+        try:
+            out, err = await asyncio.wait_for(proc.communicate(), self._timeout_s)
+        except asyncio.TimeoutError as exc:
+            proc.kill()
+            await proc.wait()
+            raise self._timeout_error(cmd) from exc
+        return proc.returncode, out or b"", err
+
+    async def _run(
+        self,
+        args: Sequence[str],
+        *,
+        check: bool = True,
+        binary: bool = False,
+        stdout: IO[bytes] | None = None,
+    ) -> str | bytes:
+        """Run an ADB command and return its stdout.
+
+        Output is decoded as text unless *binary* is True. If *stdout* is
+        given, output is streamed into that file instead.
+
+        Raises
+        ------
+        AdbError
+            If check is True and the command returns a non-zero exit code.
+        """
+        cmd, returncode, raw, stderr = await self._exec(args, stdout=stdout)
+        out = raw if binary else raw.decode(errors="replace")
+        if check and returncode != 0:
+            raise self._command_error(
+                cmd, returncode, None if binary else out, stderr.decode(errors="replace")
+            )
+        return out
+
+    async def _dump_ui_xml(self) -> bytes:
+        """Stream the UI hierarchy back in one round-trip and return the XML."""
+        raw = await self._run(["exec-out", "uiautomator", "dump", "/dev/tty"], binary=True)
+        return _strip_dump_banner(raw)
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+
+    async def start_server(self) -> str:
+        """Start the adb server if it is not already running."""
+        cmd = [self._adb_path, "start-server"]
+        returncode, stdout, stderr = await self._spawn(cmd)
+        if returncode != 0:
+            raise self._command_error(
+                cmd, returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace")
+            )
+        return "ADB server running"
+
+    async def capture_screenshot_bytes(self) -> bytes:
+        """Capture the device screen and return the PNG bytes without touching disk."""
+        return await self._run(["exec-out", "screencap", "-p"], binary=True)
+
+    async def take_screenshot(self, output_path: str | Path = "screenshot.png") -> str:
+        """Capture the device screen and save it to *output_path*."""
+        path = Path(output_path)
+        try:
+            with path.open("wb") as fh:
+                await self._run(["exec-out", "screencap", "-p"], binary=True, stdout=fh)
+        except AdbError:
+            path.unlink(missing_ok=True)
+            raise
+        return f"Saved screenshot to {path}"
+
+    async def tap_coordinates(self, x: int, y: int) -> str:
+        """Tap the screen at the given coordinates."""
+        await self._run(["shell", "input", "tap", str(x), str(y)])
+        return f"Tapped at ({x}, {y})"
+
+    async def type_text(self, text: str) -> str:
+        """Type text on the device, escaping it like the sync controller."""
+        encoded = escape_input_text(text)
+        await self._run(["shell", "input", "text", encoded])
+        return f"Typed text: {text!r}"
+
+    async def send_key_event(self, key_code: int) -> str:
+        """Send a key event to the device."""
+        await self._run(["shell", "input", "keyevent", str(key_code)])
+        return f"Sent key event: {key_code}"
+
+    async def launch_app(self, package: str) -> str:
+        """Launch an app using monkey."""
+        await self._run([
+            "shell", "monkey",
+            "-p", package,
+            "-c", "android.intent.category.LAUNCHER",
+            "1",
+        ])
+        return f"Launched app: {package}"
+
+    async def force_stop(self, package: str) -> str:
+        """Force stop an app."""
+        await self._run(["shell", "am", "force-stop", package])
+        return f"Force stopped: {package}"
+
+    async def clear_app_data(self, package: str) -> str:
+        """Clear all app data (reset to fresh install state)."""
+        await self._run(["shell", "pm", "clear", package])
+        return f"Cleared data for: {package}"
+
+    async def is_package_installed(self, package: str) -> bool:
+        """Check if a package is installed on the device (cached package list)."""
+        if self._packages is None:
+            _, returncode, stdout, _ = await self._exec(["shell", "pm", "list", "packages"])
+            packages = _parse_packages(stdout.decode(errors="replace"))
+            if returncode != 0:
+                return package in packages
+            self._packages = packages
+        return package in self._packages
+
+    async def get_screen_size(self) -> tuple[int, int]:
+        """Get the device screen resolution as (width, height), cached per instance."""
+        if self._screen_size is None:
+            self._screen_size = _parse_screen_size(await self._run(["shell", "wm", "size"]))
+        return self._screen_size
+
+    async def swipe(
+        self,
+        x1: int,
+        y1: int,
+        x2: int,
+        y2: int,
+        duration_ms: int = 300,
+    ) -> str:
+        """Perform a swipe gesture."""
+        await self._run([
+            "shell", "input", "swipe",
+            str(x1), str(y1), str(x2), str(y2), str(duration_ms),
+        ])
+        return f"Swiped from ({x1}, {y1}) to ({x2}, {y2}) in {duration_ms}ms"
+
+    async def batch_tap(self, coords: Sequence[tuple[int, int]]) -> str:
+        """Tap several points in order with a single adb round-trip."""
+        if not coords:
+            raise AdbError("batch_tap requires at least one point")
+        await self._run(["shell", " && ".join(f"input tap {x} {y}" for x, y in coords)])
+        return f"Tapped {len(coords)} point(s)"
+
+    async def execute_batch(self, shell_cmds: Sequence[str], *, stop_on_error: bool = True) -> str:
+        """Run several shell commands in one ``adb shell`` invocation."""
+        if not shell_cmds:
+            raise AdbError("execute_batch requires at least one command")
+        joined = (" && " if stop_on_error else "; ").join(shell_cmds)
+        await self._run(["shell", joined])
+        return f"Ran {len(shell_cmds)} command(s) in one batch"
+
+    async def long_press(self, x: int, y: int, duration_ms: int = 1000) -> str:
+        """Perform a long press at the given coordinates."""
+        await self._run([
+            "shell", "input", "swipe",
+            str(x), str(y), str(x), str(y), str(duration_ms),
+        ])
+        return f"Long pressed at ({x}, {y}) for {duration_ms}ms"
+
+    @staticmethod
+    async def wait(seconds: float) -> str:
+        """Wait without blocking the event loop."""
+        await asyncio.sleep(seconds)
+        return f"Waited {seconds}s"
+
+    async def wait_for_idle(
+        self,
+        package: str,
+        *,
+        timeout_s: float = 5.0,
+        quiet_ms: int = 300,
+        poll_s: float = 0.05,
+    ) -> str:
+        """Wait until *package* stops rendering frames (see the sync method)."""
+        start = time.monotonic()
+        deadline = start + timeout_s
+        quiet_s = quiet_ms / 1000.0
+        last_seen: object = object()
+        last_change = start
+
+        while True:
+            out = await self._run(["shell", "dumpsys", "gfxinfo", package, "framestats"])
+            frame_end = _parse_last_frame_end(out)
+            now = time.monotonic()
+            if frame_end != last_seen:
+                last_seen = frame_end
+                last_change = now
+            elif now - last_change >= quiet_s:
+                return f"UI idle after {now - start:.2f}s"
+            if now >= deadline:
+                return f"UI still busy after {timeout_s}s"
+            await asyncio.sleep(poll_s)
+
+    async def tap_text(self, text: str, *, partial: bool = False) -> str:
+        """Find an element by its visible text and tap on it."""
+        center_x, center_y = _find_text_center(await self._dump_ui_xml(), text, partial)
+        await self._run(["shell", "input", "tap", str(center_x), str(center_y)])
+        return f"Tapped on element with text '{text}' at ({center_x}, {center_y})"
+
+    async def tap_and_type(
+        self,
+        target_text: str,
+        input_text: str,
+        *,
+        partial: bool = False,
+        delay_ms: int = 300,
+    ) -> str:
+        """Tap on an element (to focus it), clear it, and then type text."""
+        target = _find_text_element(await self._dump_ui_xml(), target_text, partial)
+        center_x, center_y = _element_center(target)
+        delete_count = _clear_count(target)
+        steps = [
+            f"input tap {center_x} {center_y}",
+            _sleep_command(delay_ms / 1000),
+            "input keyevent 123",  # KEYCODE_MOVE_END
+        ]
+        if delete_count:
+            steps.append("input keyevent " + " ".join(["67"] * delete_count))  # KEYCODE_DEL
+        if input_text:
+            steps.append(f"input text {escape_input_text(input_text)}")
+        await self._run(["shell", " && ".join(steps)])
+        return (
+            f"Tapped on element with text '{target_text}' at ({center_x}, {center_y}); "
+            f"Cleared existing text; Typed text: {input_text!r}"
+        )
+
+    async def dump_ui_texts(self) -> list[str]:
+        """Extract all visible text labels from the current screen."""
+        return _parse_ui_texts(await self._dump_ui_xml())
+
+    async def exists_text(self, text: str, *, partial: bool = False) -> bool:
+        """Check if text exists on the current screen."""
+        return _contains_text(_iter_attr_values(await self._dump_ui_xml()), text, partial)
+
+    async def scroll_until_text(
+        self,
+        text: str,
+        *,
+        direction: str = "down",
+        max_swipes: int = 5,
+        partial: bool = False,
+    ) -> str:
+        """Scroll the screen until the specified text is visible."""
+        size, found = await asyncio.gather(
+            self.get_screen_size(), self.exists_text(text, partial=partial)
+        )
+        x1, y1, x2, y2 = _scroll_vector(*size, direction)
+        if found:
+            return f"Found text '{text}' after 0 scroll(s)"
+
+        for attempt in range(1, max_swipes + 1):
+            await self.swipe(x1, y1, x2, y2, 300)
+            await self.wait(0.5)
+            if await self.exists_text(text, partial=partial):
+                return f"Found text '{text}' after {attempt} scroll(s)"
+
+        raise AdbError(f"Text '{text}' not found after {max_swipes} scroll(s) {direction}")
+
+    async def back(self) -> str:
+        """Press the back button."""
+        return await self.send_key_event(4)  # KEYCODE_BACK
+
+    async def home(self) -> str:
+        """Press the home button."""
+        return await self.send_key_event(3)  # KEYCODE_HOME
+
+    async def relaunch_app(self, package: str) -> str:
+        """Force stop and relaunch an app."""
+        await self._run([
+            "shell",
+            f"am force-stop {package} && sleep 0.5 && "
+            f"monkey -p {package} -c android.intent.category.LAUNCHER 1",
+        ])
+        return f"Relaunched app: {package}"
+
+    async def get_current_activity(self) -> str:
+        """Get the current foreground activity."""
+        return _parse_current_activity(
+            await self._run(["shell", "dumpsys", "activity", "activities"])
+        )
@@ -0,0 +1,11 @@
+"""Shared pytest fixtures."""
+
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def unresolved_adb(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep ``adb`` unresolved so command assertions don't depend on the host PATH."""
+    monkeypatch.setattr("qualgent.tools.adb_controller.shutil.which", lambda cmd: None)
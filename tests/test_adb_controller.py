@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
+import os
+import queue
+import shlex
+import shutil
 import subprocess
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from qualgent.tools.adb_backend import MockAdbBackend, SubprocessBackend
 from qualgent.tools.adb_controller import AdbController, AdbError
 
 
@@ -17,15 +22,21 @@ from qualgent.tools.adb_controller import AdbController, AdbError
 
 
 @pytest.fixture
-def controller() -> AdbController:
+def backend() -> MockAdbBackend:
+    """Return a backend that answers every command with an empty success."""
+    return MockAdbBackend(default=subprocess.CompletedProcess([], 0, "", ""))
+
+
+@pytest.fixture
+def controller(backend: MockAdbBackend) -> AdbController:
     """Return an AdbController with no device serial."""
-    return AdbController()
+    return AdbController(backend=backend)
 
 
 @pytest.fixture
-def controller_with_serial() -> AdbController:
+def controller_with_serial(backend: MockAdbBackend) -> AdbController:
     """Return an AdbController with a specific device serial."""
-    return AdbController(device_serial="emulator-5554")
+    return AdbController(device_serial="emulator-5554", backend=backend)
 
 
 # ---------------------------------------------------------------------------
@@ -43,30 +54,34 @@ def test_base_cmd_with_serial(controller_with_serial: AdbController) -> None:
     assert controller_with_serial._base_cmd() == ["adb", "-s", "emulator-5554"]
 
 
+def test_base_cmd_uses_resolved_adb_path() -> None:
+    """adb_path is resolved against PATH once, at construction."""
+    with patch("shutil.which", return_value="/opt/android/adb") as mock_which:
+        controller = AdbController()
+
+    mock_which.assert_called_once_with("adb")
+    assert controller._base_cmd() == ["/opt/android/adb"]
+
+
 # ---------------------------------------------------------------------------
 # take_screenshot tests
 # ---------------------------------------------------------------------------
 
 
 def test_take_screenshot_saves_to_path(
-    controller: AdbController, tmp_path: Path
+    controller: AdbController, backend: MockAdbBackend, tmp_path: Path
 ) -> None:
-    """take_screenshot writes PNG bytes and returns confirmation."""
+    """take_screenshot streams PNG bytes to the file and returns confirmation."""
     fake_png = b"\x89PNG\r\n\x1a\n...fake image data..."
-    mock_result = MagicMock()
-    mock_result.returncode = 0
-    mock_result.stdout = fake_png
-    mock_result.stderr = b""
-
+    backend.default = subprocess.CompletedProcess([], 0, fake_png, b"")
     screenshot_path = tmp_path / "screenshot.png"
 
-    with patch("subprocess.run", return_value=mock_result) as mock_run:
-        result = controller.take_screenshot(screenshot_path)
+    result = controller.take_screenshot(screenshot_path)
 
     # Verify command construction
-    mock_run.assert_called_once()
-    cmd = mock_run.call_args[0][0]
-    assert cmd == ["adb", "exec-out", "screencap", "-p"]
+    assert len(backend.calls) == 1
+    assert backend.calls[-1].cmd == ["adb", "exec-out", "screencap", "-p"]
+    assert backend.calls[-1].binary
 
     # Verify file was written
     assert screenshot_path.exists()
@@ -77,22 +92,111 @@ def test_take_screenshot_saves_to_path(
     assert "Saved screenshot" in result
 
 
-def test_take_screenshot_with_serial(
-    controller_with_serial: AdbController, tmp_path: Path
+def test_take_screenshot_failure_removes_partial_file(
+    controller: AdbController, backend: MockAdbBackend, tmp_path: Path
 ) -> None:
-    """take_screenshot includes -s <serial> when serial is set."""
-    fake_png = b"\x89PNG\r\n\x1a\n"
-    mock_result = MagicMock()
-    mock_result.returncode = 0
-    mock_result.stdout = fake_png
-    mock_result.stderr = b""
+    """A failed capture raises AdbError and leaves no truncated PNG behind."""
+    backend.default = subprocess.CompletedProcess([], 1, b"\x89PNG", b"error: closed")
+    screenshot_path = tmp_path / "screenshot.png"
+
+    with pytest.raises(AdbError):
+        controller.take_screenshot(screenshot_path)
+
+    assert not screenshot_path.exists()
+
+
+def test_capture_screenshot_bytes_no_disk_io(
+    controller: AdbController,
+    backend: MockAdbBackend,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """capture_screenshot_bytes returns the PNG in memory and writes no file."""
+    fake_png = b"\x89PNG\r\n\x1a\n...fake image data..."
+    backend.default = subprocess.CompletedProcess([], 0, fake_png, b"")
+    monkeypatch.chdir(tmp_path)
+
+    assert controller.capture_screenshot_bytes() == fake_png
+    assert backend.calls[-1].cmd == ["adb", "exec-out", "screencap", "-p"]
+    assert list(tmp_path.iterdir()) == []
+
+
+def _screencaps(backend: MockAdbBackend) -> int:
+    """Count the screencap commands *backend* received."""
+    return sum(c.cmd[-2:] == ["screencap", "-p"] for c in backend.calls)
+
+
+def test_screenshots_are_fresh_by_default(
+    controller: AdbController, backend: MockAdbBackend, tmp_path: Path
+) -> None:
+    """Without cached=True every capture runs screencap."""
+    backend.default = subprocess.CompletedProcess([], 0, b"\x89PNG", b"")
+
+    controller.take_screenshot(tmp_path / "a.png")
+    controller.take_screenshot(tmp_path / "b.png")
+    controller.capture_screenshot_bytes()
+    controller.capture_screenshot_bytes()
 
-    screenshot_path = tmp_path / "out.png"
+    assert _screencaps(backend) == 4
 
-    with patch("subprocess.run", return_value=mock_result) as mock_run:
-        controller_with_serial.take_screenshot(screenshot_path)
 
-    cmd = mock_run.call_args[0][0]
+def test_cached_screenshot_reused_until_screen_may_change(
+    controller: AdbController, backend: MockAdbBackend
+) -> None:
+    """cached=True reuses the capture across read-only queries only."""
+    backend.default = subprocess.CompletedProcess([], 0, b"\x89PNG", b"")
+    backend.responses[("adb", "shell", "wm", "size")] = subprocess.CompletedProcess(
+        [], 0, "Physical size: 1080x2400\n", ""
+    )
+
+    controller.capture_screenshot_bytes(cached=True)
+    controller.get_screen_size()  # read-only: keeps the cache
+    controller.capture_screenshot_bytes(cached=True)
+    assert _screencaps(backend) == 1
+
+    controller.tap_coordinates(1, 2)
+    controller.capture_screenshot_bytes(cached=True)
+    assert _screencaps(backend) == 2
+
+
+def test_invalidate_cache_retires_cached_screenshot(
+    controller: AdbController, backend: MockAdbBackend
+) -> None:
+    """invalidate_cache (e.g. after a timed wait) makes the next capture fresh."""
+    frames = iter([b"PNG1", b"PNG2"])
+    backend.default = lambda cmd: subprocess.CompletedProcess(
+        cmd, 0, next(frames) if cmd[-1] == "-p" else "", ""
+    )
+
+    controller.launch_app("md.obsidian")
+    assert controller.capture_screenshot_bytes(cached=True) == b"PNG1"
+    controller.invalidate_cache()
+
+    assert controller.capture_screenshot_bytes(cached=True) == b"PNG2"
+
+
+def test_cached_screenshot_is_per_device(backend: MockAdbBackend) -> None:
+    """Activity on one device does not retire another device's screenshot."""
+    backend.default = subprocess.CompletedProcess([], 0, b"\x89PNG", b"")
+    first = AdbController("emulator-5554", backend=backend)
+    second = AdbController("emulator-5556", backend=backend)
+
+    first.capture_screenshot_bytes(cached=True)
+    second.tap_coordinates(1, 2)
+    with patch("time.sleep"):
+        AdbController.wait(1.0)
+    first.capture_screenshot_bytes(cached=True)
+
+    assert _screencaps(backend) == 1
+
+
+def test_take_screenshot_with_serial(
+    controller_with_serial: AdbController, backend: MockAdbBackend, tmp_path: Path
+) -> None:
+    """take_screenshot includes -s <serial> when serial is set."""
+    controller_with_serial.take_screenshot(tmp_path / "out.png")
+
+    cmd = backend.calls[-1].cmd
     assert cmd == ["adb", "-s", "emulator-5554", "exec-out", "screencap", "-p"]
 
 
@@ -101,32 +205,21 @@ def test_take_screenshot_with_serial(
 # ---------------------------------------------------------------------------
 
 
-def test_tap_coordinates(controller: AdbController) -> None:
+def test_tap_coordinates(controller: AdbController, backend: MockAdbBackend) -> None:
     """tap_coordinates sends correct command."""
-    mock_result = MagicMock()
-    mock_result.returncode = 0
-    mock_result.stdout = ""
-    mock_result.stderr = ""
+    result = controller.tap_coordinates(100, 200)
 
-    with patch("subprocess.run", return_value=mock_result) as mock_run:
-        result = controller.tap_coordinates(100, 200)
-
-    cmd = mock_run.call_args[0][0]
-    assert cmd == ["adb", "shell", "input", "tap", "100", "200"]
+    assert backend.calls[-1].cmd == ["adb", "shell", "input", "tap", "100", "200"]
     assert result == "Tapped at (100, 200)"
 
 
-def test_tap_coordinates_with_serial(controller_with_serial: AdbController) -> None:
+def test_tap_coordinates_with_serial(
+    controller_with_serial: AdbController, backend: MockAdbBackend
+) -> None:
     """tap_coordinates includes -s <serial> when serial is set."""
-    mock_result = MagicMock()
-    mock_result.returncode = 0
-    mock_result.stdout = ""
-    mock_result.stderr = ""
-
-    with patch("subprocess.run", return_value=mock_result) as mock_run:
-        controller_with_serial.tap_coordinates(50, 75)
+    controller_with_serial.tap_coordinates(50, 75)
 
-    cmd = mock_run.call_args[0][0]
+    cmd = backend.calls[-1].cmd
     assert cmd == ["adb", "-s", "emulator-5554", "shell", "input", "tap", "50", "75"]
 
 
@@ -135,48 +228,58 @@ def test_tap_coordinates_with_serial(controller_with_serial: AdbController) -> N
 # ---------------------------------------------------------------------------
 
 
-def test_type_text_encodes_spaces(controller: AdbController) -> None:
+def test_type_text_encodes_spaces(
+    controller: AdbController, backend: MockAdbBackend
+) -> None:
     """type_text converts spaces to %s."""
-    mock_result = MagicMock()
-    mock_result.returncode = 0
-    mock_result.stdout = ""
-    mock_result.stderr = ""
-
-    with patch("subprocess.run", return_value=mock_result) as mock_run:
-        result = controller.type_text("hello world")
+    result = controller.type_text("hello world")
 
-    cmd = mock_run.call_args[0][0]
-    assert cmd == ["adb", "shell", "input", "text", "hello%sworld"]
+    assert backend.calls[-1].cmd == ["adb", "shell", "input", "text", "hello%sworld"]
     assert result == "Typed text: 'hello world'"
 
 
-def test_type_text_no_spaces(controller: AdbController) -> None:
+def test_type_text_no_spaces(controller: AdbController, backend: MockAdbBackend) -> None:
     """type_text with no spaces passes text directly."""
-    mock_result = MagicMock()
-    mock_result.returncode = 0
-    mock_result.stdout = ""
-    mock_result.stderr = ""
+    controller.type_text("nospaces")
 
-    with patch("subprocess.run", return_value=mock_result) as mock_run:
-        controller.type_text("nospaces")
+    assert backend.calls[-1].cmd == ["adb", "shell", "input", "text", "nospaces"]
 
-    cmd = mock_run.call_args[0][0]
-    assert cmd == ["adb", "shell", "input", "text", "nospaces"]
 
-
-def test_type_text_escapes_special_chars(controller: AdbController) -> None:
+def test_type_text_escapes_special_chars(
+    controller: AdbController, backend: MockAdbBackend
+) -> None:
     """type_text escapes shell metacharacters."""
-    mock_result = MagicMock()
-    mock_result.returncode = 0
-    mock_result.stdout = ""
-    mock_result.stderr = ""
-
-    with patch("subprocess.run", return_value=mock_result) as mock_run:
-        controller.type_text("test'quote")
+    controller.type_text("test'quote")
 
-    cmd = mock_run.call_args[0][0]
     # Single quote should be escaped with backslash
-    assert cmd == ["adb", "shell", "input", "text", "test\\'quote"]
+    assert backend.calls[-1].cmd == ["adb", "shell", "input", "text", "test\\'quote"]
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("a&b", "a\\&b"),
+        ("x<y>z", "x\\<y\\>z"),
+        ("*.md?", "\\*.md\\?"),
+        ("a|b;c", "a\\|b\\;c"),
+    ],
+)
+def test_type_text_escapes_shell_operators(
+    controller: AdbController, backend: MockAdbBackend, text: str, expected: str
+) -> None:
+    """Shell operators and glob characters reach `input text` literally."""
+    controller.type_text(text)
+
+    assert backend.calls[-1].cmd[-1] == expected
+
+
+def test_type_text_escapes_backslash_once(
+    controller: AdbController, backend: MockAdbBackend
+) -> None:
+    """Escaping is single-pass: inserted backslashes are not escaped again."""
+    controller.type_text('a\\b "c" $(d)')
+
+    assert backend.calls[-1].cmd[-1] == 'a\\\\b%s\\"c\\"%s\\$\\(d\\)'
 
 
 # ---------------------------------------------------------------------------
@@ -184,47 +287,49 @@ def test_type_text_escapes_special_chars(controller: AdbController) -> None:
 # ---------------------------------------------------------------------------
 
 
-def test_send_key_event_home(controller: AdbController) -> None:
-    """send_key_event sends HOME key (3)."""
-    mock_result = MagicMock()
-    mock_result.returncode = 0
-    mock_result.stdout = ""
-    mock_result.stderr = ""
+@pytest.mark.parametrize("keycode", [3, 4, 66])  # HOME, BACK, ENTER
+def test_send_key_event(
+    controller: AdbController, backend: MockAdbBackend, keycode: int
+) -> None:
+    """send_key_event sends the given keycode."""
+    result = controller.send_key_event(keycode)
 
-    with patch("subprocess.run", return_value=mock_result) as mock_run:
-        result = controller.send_key_event(3)
+    assert backend.calls[-1].cmd == ["adb", "shell", "input", "keyevent", str(keycode)]
+    assert result == f"Sent key event: {keycode}"
 
-    cmd = mock_run.call_args[0][0]
-    assert cmd == ["adb", "shell", "input", "keyevent", "3"]
-    assert result == "Sent key event: 3"
 
+# ---------------------------------------------------------------------------
+# SubprocessBackend tests
+# ---------------------------------------------------------------------------
 
-def test_send_key_event_back(controller: AdbController) -> None:
-    """send_key_event sends BACK key (4)."""
-    mock_result = MagicMock()
-    mock_result.returncode = 0
-    mock_result.stdout = ""
-    mock_result.stderr = ""
 
-    with patch("subprocess.run", return_value=mock_result) as mock_run:
-        controller.send_key_event(4)
+def test_subprocess_stdin_is_devnull() -> None:
+    """Commands never inherit or open a stdin pipe."""
+    ok = subprocess.CompletedProcess([], 0, "", "")
+    with patch("subprocess.run", return_value=ok) as mock_run:
+        AdbController().send_key_event(3)
+
+    assert mock_run.call_args.kwargs["stdin"] is subprocess.DEVNULL
+
 
-    cmd = mock_run.call_args[0][0]
-    assert cmd == ["adb", "shell", "input", "keyevent", "4"]
+@pytest.mark.skipif(os.name == "nt", reason="close_fds is only relaxed on POSIX")
+def test_subprocess_skips_close_fds_on_posix() -> None:
+    """Spawns pass close_fds=False so subprocess can use posix_spawn."""
+    ok = subprocess.CompletedProcess([], 0, "", "")
+    with patch("subprocess.run", return_value=ok) as mock_run:
+        AdbController().send_key_event(3)
 
+    assert mock_run.call_args.kwargs["close_fds"] is False
 
-def test_send_key_event_enter(controller: AdbController) -> None:
-    """send_key_event sends ENTER key (66)."""
-    mock_result = MagicMock()
-    mock_result.returncode = 0
-    mock_result.stdout = ""
-    mock_result.stderr = ""
 
-    with patch("subprocess.run", return_value=mock_result) as mock_run:
-        controller.send_key_event(66)
+def test_subprocess_backend_passes_timeout_and_mode() -> None:
+    """SubprocessBackend forwards the timeout and text/binary mode."""
+    with patch("subprocess.run") as mock_run:
+        SubprocessBackend().run(["adb", "devices"], binary=True, timeout=3.0)
 
-    cmd = mock_run.call_args[0][0]
-    assert cmd == ["adb", "shell", "input", "keyevent", "66"]
+    assert mock_run.call_args[0][0] == ["adb", "devices"]
+    assert mock_run.call_args.kwargs["timeout"] == 3.0
+    assert mock_run.call_args.kwargs["text"] is False
 
 
 # ---------------------------------------------------------------------------
@@ -232,30 +337,240 @@ def test_send_key_event_enter(controller: AdbController) -> None:
 # ---------------------------------------------------------------------------
 
 
-def test_adb_error_on_command_failure(controller: AdbController) -> None:
+def test_adb_error_on_command_failure(
+    controller: AdbController, backend: MockAdbBackend
+) -> None:
     """AdbError is raised when command fails."""
-    mock_result = MagicMock()
-    mock_result.returncode = 1
-    mock_result.stdout = ""
-    mock_result.stderr = "error: device not found"
+    backend.default = subprocess.CompletedProcess([], 1, "", "error: device not found")
 
-    with patch("subprocess.run", return_value=mock_result):
-        with pytest.raises(AdbError) as exc_info:
-            controller.tap_coordinates(0, 0)
+    with pytest.raises(AdbError) as exc_info:
+        controller.tap_coordinates(0, 0)
 
     assert exc_info.value.returncode == 1
     assert "device not found" in str(exc_info.value)
 
 
-def test_timeout_raises_adb_error(controller: AdbController) -> None:
+def test_restarts_server_and_retries_when_daemon_unreachable(
+    controller: AdbController, backend: MockAdbBackend
+) -> None:
+    """A command that cannot reach the adb server triggers start-server and one retry."""
+    replies = iter(
+        [
+            subprocess.CompletedProcess([], 1, "", "error: cannot connect to daemon"),
+            subprocess.CompletedProcess([], 0, "", ""),
+            subprocess.CompletedProcess([], 0, "", ""),
+        ]
+    )
+    backend.default = lambda cmd: next(replies)
+
+    controller.tap_coordinates(1, 2)
+
+    assert [c.cmd for c in backend.calls] == [
+        ["adb", "shell", "input", "tap", "1", "2"],
+        ["adb", "start-server"],
+        ["adb", "shell", "input", "tap", "1", "2"],
+    ]
+
+
+def test_timeout_raises_adb_error() -> None:
     """Timeout during command execution raises AdbError."""
-    controller_with_timeout = AdbController(timeout_s=5.0)
+    backend = MockAdbBackend(default=subprocess.TimeoutExpired(cmd=["adb"], timeout=5))
+    controller = AdbController(timeout_s=5.0, backend=backend)
+
+    with pytest.raises(AdbError) as exc_info:
+        controller.tap_coordinates(0, 0)
+
+    assert "timed out" in str(exc_info.value).lower()
+    assert backend.calls[-1].timeout == 5.0
+
+
+def test_mock_backend_answers_by_command(backend: MockAdbBackend) -> None:
+    """Responses keyed by argv take precedence over the default."""
+    backend.responses[("adb", "shell", "wm", "size")] = subprocess.CompletedProcess(
+        [], 0, "Physical size: 1080x2400\n", ""
+    )
+
+    assert AdbController(backend=backend).get_screen_size() == (1080, 2400)
+
+
+# ---------------------------------------------------------------------------
+# Persistent shell tests
+# ---------------------------------------------------------------------------
+
+
+class FakeShellProcess:
+    """Stand-in for a long-lived `adb shell` Popen.
+
+    Records every command line written to stdin and answers it from
+    *responses* (command -> (output, exit code)), followed by the marker.
+    """
+
+    def __init__(self, responses: dict[str, tuple[bytes, int]] | None = None) -> None:
+        self.responses = responses or {}
+        self.commands: list[str] = []
+        self._lines: queue.Queue[bytes] = queue.Queue()
+        self.stdin = MagicMock()
+        self.stdin.write.side_effect = self._on_write
+        self.stdout = MagicMock()
+        self.stdout.readline.side_effect = self._lines.get
+
+    def _on_write(self, data: bytes) -> None:
+        text = data.decode()
+        if text == "exit\n":
+            self._lines.put(b"")
+            return
+        cmdline = shlex.split(text)[2]  # sh -c <cmdline> ...
+        self.commands.append(cmdline)
+        if cmdline == "hang":
+            return
+        output, returncode = self.responses.get(cmdline, (b"", 0))
+        if output:
+            self._lines.put(output)
+        self._lines.put(b"__QGEND__%d\n" % returncode)
+
+    def poll(self) -> int | None:
+        return None
+
+    def wait(self, timeout: float | None = None) -> int:
+        return 0
+
+    def kill(self) -> None:
+        self._lines.put(b"")
+
+
+def test_persistent_shell_reuses_one_process() -> None:
+    """Shell commands share one adb shell and never reach the backend."""
+    fake = FakeShellProcess()
+    backend = MockAdbBackend()
+    controller = AdbController(
+        device_serial="emulator-5554", persistent_shell=True, backend=backend
+    )
+
+    with patch("subprocess.Popen", return_value=fake) as mock_popen:
+        controller.tap_coordinates(100, 200)
+        controller.send_key_event(4)
+        controller.close()
+
+    mock_popen.assert_called_once()
+    assert mock_popen.call_args[0][0] == ["adb", "-s", "emulator-5554", "shell"]
+    assert backend.calls == []
+    assert fake.commands == ["input tap 100 200", "input keyevent 4"]
+
+
+@pytest.mark.parametrize(
+    ("call", "expected"),
+    [
+        (lambda c: c.tap_coordinates(540, 1080), "input tap 540 1080"),
+        (lambda c: c.type_text("a b"), "input text a%sb"),
+        (lambda c: c.send_key_event(66), "input keyevent 66"),
+        (lambda c: c.swipe(1, 2, 3, 4, 250), "input swipe 1 2 3 4 250"),
+        (lambda c: c.long_press(5, 6), "input swipe 5 6 5 6 1000"),
+        (
+            lambda c: c.launch_app("md.obsidian"),
+            "monkey -p md.obsidian -c android.intent.category.LAUNCHER 1",
+        ),
+        (lambda c: c.force_stop("md.obsidian"), "am force-stop md.obsidian"),
+        (lambda c: c.clear_app_data("md.obsidian"), "pm clear md.obsidian"),
+        (lambda c: c.is_package_installed("md.obsidian"), "pm list packages"),
+    ],
+)
+def test_persistent_shell_command_lines(call: object, expected: str) -> None:
+    """Each helper writes the same command line a one-shot adb shell would run."""
+    fake = FakeShellProcess()
+    backend = MockAdbBackend()
+    controller = AdbController(persistent_shell=True, backend=backend)
+
+    with patch("subprocess.Popen", return_value=fake):
+        call(controller)  # type: ignore[operator]
+        controller.close()
+
+    assert backend.calls == []
+    assert fake.commands == [expected]
+
+
+def test_persistent_shell_returns_output() -> None:
+    """Output before the marker is returned, even without a trailing newline."""
+    fake = FakeShellProcess({"wm size": (b"Physical size: 1080x1920", 0)})
+    controller = AdbController(persistent_shell=True)
+
+    with patch("subprocess.Popen", return_value=fake):
+        assert controller.get_screen_size() == (1080, 1920)
+        controller.close()
+
+
+def test_persistent_shell_nonzero_exit_raises() -> None:
+    """A non-zero exit status from the session raises AdbError."""
+    fake = FakeShellProcess({"pm clear md.obsidian": (b"Failed\n", 1)})
+    controller = AdbController(persistent_shell=True)
+
+    with patch("subprocess.Popen", return_value=fake):
+        with pytest.raises(AdbError) as exc_info:
+            controller.clear_app_data("md.obsidian")
+        controller.close()
+
+    assert exc_info.value.returncode == 1
+    assert "Failed" in str(exc_info.value)
+
+
+def test_persistent_shell_timeout_raises() -> None:
+    """A command that never reports back times out with AdbError."""
+    fake = FakeShellProcess()
+    controller = AdbController(persistent_shell=True, timeout_s=0.05)
+
+    with patch("subprocess.Popen", return_value=fake):
+        with pytest.raises(AdbError) as exc_info:
+            controller._run(["shell", "hang"])
+
+    assert "timed out" in str(exc_info.value).lower()
+
+
+@pytest.mark.skipif(shutil.which("sh") is None, reason="needs a POSIX sh")
+def test_persistent_shell_syntax_error_fails_fast() -> None:
+    """An unbalanced quote fails immediately and leaves the session usable."""
+    real_popen = subprocess.Popen
+    controller = AdbController(persistent_shell=True, timeout_s=5.0)
 
     with patch(
-        "subprocess.run", side_effect=subprocess.TimeoutExpired(cmd=["adb"], timeout=5)
+        "subprocess.Popen", side_effect=lambda cmd, **kwargs: real_popen(["sh"], **kwargs)
     ):
         with pytest.raises(AdbError) as exc_info:
-            controller_with_timeout.tap_coordinates(0, 0)
+            controller._run(["shell", "echo", "a'b"])
+        assert controller._run(["shell", "echo", "ok"]).stdout == "ok\n"
+        controller.close()
 
-    assert "timed out" in str(exc_info.value).lower()
+    assert exc_info.value.returncode not in (None, 0)
+    assert "timed out" not in str(exc_info.value).lower()
 
+
+@pytest.mark.skipif(shutil.which("sh") is None, reason="needs a POSIX sh")
+def test_compiled_sequence_stops_inside_and_chain(
+    controller: AdbController, backend: MockAdbBackend, tmp_path: Path
+) -> None:
+    """A failing non-final && member ends the script with its status."""
+    log = tmp_path / "log"
+    seq = controller.compile_sequence([
+        f"echo one >> {log}",
+        f"false && echo skipped >> {log}",
+        f"echo never >> {log}",
+    ])
+    upload = backend.calls[0].cmd[2].replace("/data/local/tmp/", f"{tmp_path}/")
+    script = Path(seq.path.replace("/data/local/tmp/", f"{tmp_path}/"))
+
+    subprocess.run(["sh", "-c", upload], check=True)
+    result = subprocess.run(["sh", str(script)], check=False)
+
+    assert result.returncode == 1
+    assert log.read_text() == "one\n"
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(["log", script.name])
+
+
+def test_persistent_shell_keeps_screenshot_on_subprocess(tmp_path: Path) -> None:
+    """Binary exec-out commands still spawn a one-shot subprocess."""
+    backend = MockAdbBackend(default=subprocess.CompletedProcess([], 0, b"\x89PNG", b""))
+    controller = AdbController(persistent_shell=True, backend=backend)
+
+    with patch("subprocess.Popen") as mock_popen:
+        controller.take_screenshot(tmp_path / "shot.png")
+
+    mock_popen.assert_not_called()
+    assert backend.calls[-1].cmd == ["adb", "exec-out", "screencap", "-p"]
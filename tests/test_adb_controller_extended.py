@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import subprocess
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from qualgent.tools import adb_controller
 from qualgent.tools.adb_controller import AdbController, AdbError
 
 
@@ -109,6 +111,51 @@ def test_is_package_installed_false(controller: AdbController) -> None:
     assert result is False
 
 
+def test_is_package_installed_caches_package_list(controller: AdbController) -> None:
+    """is_package_installed lists packages once and answers exact names from cache."""
+    mock_result = MagicMock()
+    mock_result.returncode = 0
+    mock_result.stdout = "package:md.obsidian\npackage:md.obsidian.beta\n"
+    mock_result.stderr = ""
+
+    with patch("subprocess.run", return_value=mock_result) as mock_run:
+        assert controller.is_package_installed("md.obsidian") is True
+        assert controller.is_package_installed("md.obsidian.beta") is True
+        assert controller.is_package_installed("md.obs") is False
+
+    mock_run.assert_called_once()
+    assert mock_run.call_args[0][0] == ["adb", "shell", "pm", "list", "packages"]
+
+
+@pytest.mark.parametrize(
+    "listing",
+    ["package:md.obsidian\r\npackage:com.other\r\n", "package:com.other\npackage:md.obsidian"],
+)
+def test_is_package_installed_line_endings(controller: AdbController, listing: str) -> None:
+    """CRLF output (older adbd with a PTY) and an unterminated last line still match."""
+    mock_result = MagicMock()
+    mock_result.returncode = 0
+    mock_result.stdout = listing
+    mock_result.stderr = ""
+
+    with patch("subprocess.run", return_value=mock_result):
+        assert controller.is_package_installed("md.obsidian") is True
+
+
+def test_is_package_installed_failure_not_cached(controller: AdbController) -> None:
+    """A failed package listing is not cached."""
+    mock_result = MagicMock()
+    mock_result.returncode = 1
+    mock_result.stdout = ""
+    mock_result.stderr = "error: device offline"
+
+    with patch("subprocess.run", return_value=mock_result) as mock_run:
+        assert controller.is_package_installed("md.obsidian") is False
+        assert controller.is_package_installed("md.obsidian") is False
+
+    assert mock_run.call_count == 2
+
+
 # ---------------------------------------------------------------------------
 # Screen / input helper tests
 # ---------------------------------------------------------------------------
@@ -145,6 +192,35 @@ def test_get_screen_size_with_override(controller: AdbController) -> None:
     assert height == 1920
 
 
+def test_get_screen_size_unparseable_raises(controller: AdbController) -> None:
+    """get_screen_size raises AdbError when no physical size is reported."""
+    mock_result = MagicMock()
+    mock_result.returncode = 0
+    mock_result.stdout = "Override size: 720x1280\n"
+    mock_result.stderr = ""
+
+    with patch("subprocess.run", return_value=mock_result):
+        with pytest.raises(AdbError):
+            controller.get_screen_size()
+
+
+def test_get_screen_size_is_cached(controller: AdbController) -> None:
+    """get_screen_size queries the device once until the cache is invalidated."""
+    mock_result = MagicMock()
+    mock_result.returncode = 0
+    mock_result.stdout = "Physical size: 1080x1920\n"
+    mock_result.stderr = ""
+
+    with patch("subprocess.run", return_value=mock_result) as mock_run:
+        assert controller.get_screen_size() == (1080, 1920)
+        assert controller.get_screen_size() == (1080, 1920)
+        assert mock_run.call_count == 1
+
+        controller.invalidate_cache()
+        controller.get_screen_size()
+        assert mock_run.call_count == 2
+
+
 def test_swipe(controller: AdbController) -> None:
     """swipe sends correct command with coordinates and duration."""
     mock_result = MagicMock()
@@ -189,6 +265,334 @@ def test_long_press(controller: AdbController) -> None:
     assert "1500ms" in result
 
 
+def test_batch_tap_chains_taps_in_one_command(controller: AdbController) -> None:
+    """batch_tap sends all taps, in order, as one adb shell call."""
+    mock_result = MagicMock()
+    mock_result.returncode = 0
+    mock_result.stdout = ""
+    mock_result.stderr = ""
+
+    with patch("subprocess.run", return_value=mock_result) as mock_run:
+        result = controller.batch_tap([(10, 20), (30, 40)])
+
+    mock_run.assert_called_once()
+    cmd = mock_run.call_args[0][0]
+    assert cmd == ["adb", "shell", "input tap 10 20 && input tap 30 40"]
+    assert "2 point(s)" in result
+
+
+def test_batch_tap_empty_raises(controller: AdbController) -> None:
+    """batch_tap rejects an empty coordinate list."""
+    with pytest.raises(AdbError):
+        controller.batch_tap([])
+
+
+GETEVENT_OUTPUT = """add device 1: /dev/input/event0
+  name:     "qwerty2"
+  events:
+    KEY (0001): KEY_ESC KEY_1
+add device 2: /dev/input/event1
+  name:     "virtio_input_multi_touch_7"
+  events:
+    ABS (0003): ABS_MT_SLOT           : value 0, min 0, max 9, fuzz 0, flat 0, resolution 0
+                ABS_MT_POSITION_X     : value 0, min 0, max 32767, fuzz 0, flat 0, resolution 0
+                ABS_MT_POSITION_Y     : value 0, min 0, max 32767, fuzz 0, flat 0, resolution 0
+                ABS_MT_TRACKING_ID    : value 0, min 0, max 65535, fuzz 0, flat 0, resolution 0
+"""
+
+
+def test_run_gesture_sends_one_sendevent_script(controller: AdbController) -> None:
+    """run_gesture scales points to the touch device and sends one shell command."""
+    results = []
+    for out in (GETEVENT_OUTPUT, "Physical size: 1080x1920\n", ""):
+        mock_result = MagicMock()
+        mock_result.returncode = 0
+        mock_result.stdout = out
+        mock_result.stderr = ""
+        results.append(mock_result)
+
+    with patch("subprocess.run", side_effect=results) as mock_run:
+        result = controller.run_gesture([(0, 0, 0), (540, 960, 50)])
+
+    assert mock_run.call_count == 3
+    cmd = mock_run.call_args[0][0]
+    assert cmd[:2] == ["adb", "shell"]
+    script = cmd[2].split(" && ")
+    assert script[0] == "sendevent /dev/input/event1 3 57 0"
+    assert "sendevent /dev/input/event1 3 53 16383" in script
+    assert "sendevent /dev/input/event1 3 54 16383" in script
+    assert "sleep 0.05" in script
+    assert script[-1] == "sendevent /dev/input/event1 0 0 0"
+    assert "2 point(s)" in result
+
+
+def test_run_gesture_without_touch_device_raises(controller: AdbController) -> None:
+    """run_gesture raises AdbError when no multi-touch device exists."""
+    mock_result = MagicMock()
+    mock_result.returncode = 0
+    mock_result.stdout = "add device 1: /dev/input/event0\n  name: \"qwerty2\"\n"
+    mock_result.stderr = ""
+
+    with patch("subprocess.run", return_value=mock_result):
+        with pytest.raises(AdbError):
+            controller.run_gesture([(0, 0, 0)])
+
+
+UI_DUMP = (
+    b'<?xml version="1.0" encoding="UTF-8"?><hierarchy rotation="0">'
+    b'<node text="Title" class="android.widget.EditText" clickable="true" '
+    b'focusable="true" bounds="[0,100][1080,200]" />'
+    b"</hierarchy>UI hierchary dumped to: /dev/tty\n"
+)
+
+
+def test_dump_ui_texts_streams_dump_in_one_call(controller: AdbController) -> None:
+    """dump_ui_texts reads the dump via exec-out and ignores the trailing banner."""
+    mock_result = MagicMock()
+    mock_result.returncode = 0
+    mock_result.stdout = UI_DUMP
+    mock_result.stderr = b""
+
+    with patch("subprocess.run", return_value=mock_result) as mock_run:
+        texts = controller.dump_ui_texts()
+
+    mock_run.assert_called_once()
+    cmd = mock_run.call_args[0][0]
+    assert cmd == ["adb", "exec-out", "uiautomator", "dump", "/dev/tty"]
+    assert texts == ["Title"]
+
+
+def test_dump_ui_texts_truncated_dump_returns_empty(controller: AdbController) -> None:
+    """dump_ui_texts returns no labels when the dump is cut off mid-stream."""
+    mock_result = MagicMock()
+    mock_result.returncode = 0
+    mock_result.stdout = UI_DUMP[:120]
+    mock_result.stderr = b""
+
+    with patch("subprocess.run", return_value=mock_result):
+        assert controller.dump_ui_texts() == []
+
+
+NESTED_UI_DUMP = (
+    b'<?xml version="1.0" encoding="UTF-8"?><hierarchy rotation="0">'
+    b'<node text="Toolbar"><node content-desc="Back" /><node text="Title" /></node>'
+    b'<node text="Footer" />'
+    b"</hierarchy>"
+)
+
+
+def test_parse_ui_texts_keeps_document_order() -> None:
+    """Labels come out parents-first, in the order they appear on screen."""
+    assert adb_controller._parse_ui_texts(NESTED_UI_DUMP) == [
+        "Toolbar", "Back", "Title", "Footer",
+    ]
+
+
+def test_parse_ui_texts_with_lxml_keeps_document_order(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """The lxml parser path yields the same labels in the same order."""
+    lxml_etree = pytest.importorskip("lxml.etree")
+    monkeypatch.setattr(adb_controller, "_etree", lxml_etree)
+    monkeypatch.setattr(adb_controller, "_HAVE_LXML", True)
+
+    assert adb_controller._parse_ui_texts(NESTED_UI_DUMP) == [
+        "Toolbar", "Back", "Title", "Footer",
+    ]
+    assert adb_controller._parse_ui_texts(NESTED_UI_DUMP[:90]) == []
+
+
+def test_exists_text_scans_raw_dump(controller: AdbController) -> None:
+    """exists_text matches text/content-desc/hint attributes without parsing XML."""
+    mock_result = MagicMock()
+    mock_result.returncode = 0
+    mock_result.stdout = (
+        b'<hierarchy><node text="" content-desc="Save &amp; exit" '
+        b'hint=" Search " bounds="[0,0][1,1]" /></hierarchy>'
+    )
+    mock_result.stderr = b""
+
+    with patch("subprocess.run", return_value=mock_result):
+        assert controller.exists_text("Save & exit")
+        assert controller.exists_text("Search")
+        assert controller.exists_text("save", partial=True)
+        assert not controller.exists_text("Save")
+        assert not controller.exists_text("")
+
+
+def test_scroll_until_text_swipes_until_found(controller: AdbController) -> None:
+    """scroll_until_text swipes between dumps and reports the scroll count."""
+    dumps = iter([b"<hierarchy />", UI_DUMP])
+
+    def fake_run(cmd: list[str], **kwargs: object) -> MagicMock:
+        mock_result = MagicMock()
+        mock_result.returncode = 0
+        mock_result.stderr = ""
+        if cmd[1:] == ["shell", "wm", "size"]:
+            mock_result.stdout = "Physical size: 1000x2000\n"
+        elif cmd[1] == "exec-out":
+            mock_result.stdout = next(dumps)
+        else:
+            mock_result.stdout = ""
+        return mock_result
+
+    with patch("subprocess.run", side_effect=fake_run) as mock_run, patch("time.sleep"):
+        result = controller.scroll_until_text("Title")
+
+    swipes = [c[0][0] for c in mock_run.call_args_list if "swipe" in c[0][0]]
+    assert swipes == [["adb", "shell", "input", "swipe", "500", "1400", "500", "600", "300"]]
+    assert "after 1 scroll(s)" in result
+
+
+def test_tap_text_prefers_interactive_match(controller: AdbController) -> None:
+    """tap_text taps the highest-priority match, first one on ties."""
+    dump = MagicMock()
+    dump.returncode = 0
+    dump.stdout = (
+        b"<hierarchy>"
+        b'<node text="Save" class="android.widget.TextView" bounds="[0,0][10,10]" />'
+        b'<node text="Save" class="android.widget.Button" clickable="true" '
+        b'bounds="[100,100][200,200]" />'
+        b'<node text="Save" class="android.widget.Button" clickable="true" '
+        b'bounds="[300,300][400,400]" />'
+        b"</hierarchy>"
+    )
+    dump.stderr = b""
+    tap = MagicMock()
+    tap.returncode = 0
+    tap.stdout = ""
+    tap.stderr = ""
+
+    with patch("subprocess.run", side_effect=[dump, tap]) as mock_run:
+        result = controller.tap_text("Save")
+
+    assert mock_run.call_args[0][0] == ["adb", "shell", "input", "tap", "150", "150"]
+    assert "(150, 150)" in result
+
+
+def test_scroll_until_text_not_found_dumps_once_per_screen(controller: AdbController) -> None:
+    """With N swipes, scroll_until_text dumps N + 1 times and then raises."""
+
+    def fake_run(cmd: list[str], **kwargs: object) -> MagicMock:
+        mock_result = MagicMock()
+        mock_result.returncode = 0
+        mock_result.stderr = ""
+        if cmd[1:] == ["shell", "wm", "size"]:
+            mock_result.stdout = "Physical size: 1000x2000\n"
+        elif cmd[1] == "exec-out":
+            mock_result.stdout = b"<hierarchy />"
+        else:
+            mock_result.stdout = ""
+        return mock_result
+
+    with patch("subprocess.run", side_effect=fake_run) as mock_run, patch("time.sleep"):
+        with pytest.raises(AdbError, match="after 3 scroll"):
+            controller.scroll_until_text("Missing", max_swipes=3)
+
+    cmds = [c[0][0] for c in mock_run.call_args_list]
+    assert sum(cmd[1] == "exec-out" for cmd in cmds) == 4
+    assert sum("swipe" in cmd for cmd in cmds) == 3
+
+
+def test_tap_and_type_sends_one_shell_command(controller: AdbController) -> None:
+    """tap_and_type taps, clears and types in a single adb shell call."""
+    results = []
+    for out in (UI_DUMP, ""):
+        mock_result = MagicMock()
+        mock_result.returncode = 0
+        mock_result.stdout = out
+        mock_result.stderr = ""
+        results.append(mock_result)
+
+    with patch("subprocess.run", side_effect=results) as mock_run, patch("time.sleep") as mock_sleep:
+        result = controller.tap_and_type("Title", "My note")
+
+    assert mock_run.call_count == 2
+    mock_sleep.assert_not_called()
+    cmd = mock_run.call_args[0][0]
+    assert cmd[:2] == ["adb", "shell"]
+    script = cmd[2].split(" && ")
+    assert script[0] == "input tap 540 150"
+    assert script[1] == "sleep 0.3"
+    assert script[2] == "input keyevent 123"
+    assert script[3] == "input keyevent " + " ".join(["67"] * len("Title"))
+    assert script[4] == "input text My%snote"
+    assert "Typed text: 'My note'" in result
+
+
+def test_tap_and_type_non_input_target_uses_default_clear(controller: AdbController) -> None:
+    """When the matched element is not an input field, 30 DEL presses are sent."""
+    dump = MagicMock()
+    dump.returncode = 0
+    dump.stdout = (
+        b'<hierarchy><node text="Vault name" class="android.widget.TextView" '
+        b'bounds="[0,0][100,100]" /></hierarchy>'
+    )
+    dump.stderr = b""
+    ok = MagicMock()
+    ok.returncode = 0
+    ok.stdout = ""
+    ok.stderr = ""
+
+    with patch("subprocess.run", side_effect=[dump, ok]) as mock_run:
+        controller.tap_and_type("Vault name", "")
+
+    script = mock_run.call_args[0][0][2].split(" && ")
+    assert script[-1] == "input keyevent " + " ".join(["67"] * 30)
+
+
+def test_relaunch_app_single_command(controller: AdbController) -> None:
+    """relaunch_app stops and relaunches the app in one adb shell call."""
+    mock_result = MagicMock()
+    mock_result.returncode = 0
+    mock_result.stdout = ""
+    mock_result.stderr = ""
+
+    with patch("subprocess.run", return_value=mock_result) as mock_run:
+        result = controller.relaunch_app("md.obsidian")
+
+    mock_run.assert_called_once()
+    cmd = mock_run.call_args[0][0]
+    assert cmd == [
+        "adb", "shell",
+        "am force-stop md.obsidian && sleep 0.5 && "
+        "monkey -p md.obsidian -c android.intent.category.LAUNCHER 1",
+    ]
+    assert "Relaunched" in result
+
+
+def test_get_current_activity(controller: AdbController) -> None:
+    """get_current_activity extracts the component from the resumed activity line."""
+    mock_result = MagicMock()
+    mock_result.returncode = 0
+    mock_result.stdout = (
+        "  Stack #1:\n"
+        "    mResumedActivity: ActivityRecord{4f2c u0 md.obsidian/.MainActivity t12}\n"
+    )
+    mock_result.stderr = ""
+
+    with patch("subprocess.run", return_value=mock_result):
+        assert controller.get_current_activity() == "md.obsidian/.MainActivity"
+
+
+def test_get_current_activity_ignores_other_records(controller: AdbController) -> None:
+    """Only the resumed/focused activity line is considered."""
+    mock_result = MagicMock()
+    mock_result.returncode = 0
+    mock_result.stdout = (
+        "    mLastPausedActivity: ActivityRecord{1a u0 com.android.launcher/.Home t1}\n"
+        "  mFocusedActivity: ActivityRecord{2b u0 md.obsidian/.MainActivity t12}\n"
+    )
+    mock_result.stderr = ""
+
+    with patch("subprocess.run", return_value=mock_result):
+        assert controller.get_current_activity() == "md.obsidian/.MainActivity"
+
+    mock_result.stdout = "  Stack #0:\n"
+    with patch("subprocess.run", return_value=mock_result):
+        assert controller.get_current_activity() == ""
+
+
 def test_wait() -> None:
     """wait sleeps for specified time."""
     with patch("time.sleep") as mock_sleep:
@@ -198,6 +602,68 @@ def test_wait() -> None:
     assert "2.5" in result
 
 
+def test_wait_async_does_not_block() -> None:
+    """wait_async awaits asyncio.sleep instead of sleeping the thread."""
+    with (
+        patch("asyncio.sleep", new=AsyncMock()) as mock_sleep,
+        patch("time.sleep") as mock_time_sleep,
+    ):
+        result = asyncio.run(AdbController.wait_async(2.5))
+
+    mock_sleep.assert_awaited_once_with(2.5)
+    mock_time_sleep.assert_not_called()
+    assert result == "Waited 2.5s"
+
+
+def _framestats(*frame_ends: int) -> str:
+    """Build minimal gfxinfo framestats output with the given FrameCompleted values."""
+    rows = "\n".join(f"0,1,2,{end}," for end in frame_ends)
+    return (
+        "Stats since: 123ns\n"
+        "---PROFILEDATA---\n"
+        "Flags,IntendedVsync,Vsync,FrameCompleted,\n"
+        f"{rows}\n"
+        "---PROFILEDATA---\n"
+    )
+
+
+def test_wait_for_idle_returns_once_frames_stop(controller: AdbController) -> None:
+    """wait_for_idle stops polling once the last frame timestamp is stable."""
+    outputs = [_framestats(100), _framestats(100, 200), _framestats(100, 200)]
+    results = []
+    for out in outputs:
+        mock_result = MagicMock()
+        mock_result.returncode = 0
+        mock_result.stdout = out
+        mock_result.stderr = ""
+        results.append(mock_result)
+
+    with patch("subprocess.run", side_effect=results) as mock_run, patch("time.sleep"):
+        result = controller.wait_for_idle("md.obsidian", quiet_ms=0)
+
+    assert mock_run.call_count == 3
+    cmd = mock_run.call_args[0][0]
+    assert cmd == ["adb", "shell", "dumpsys", "gfxinfo", "md.obsidian", "framestats"]
+    assert "idle" in result
+
+
+def test_wait_for_idle_gives_up_at_timeout(controller: AdbController) -> None:
+    """wait_for_idle returns without raising if frames keep arriving."""
+    frame = iter(range(1000))
+
+    def busy(*args: object, **kwargs: object) -> MagicMock:
+        mock_result = MagicMock()
+        mock_result.returncode = 0
+        mock_result.stdout = _framestats(next(frame))
+        mock_result.stderr = ""
+        return mock_result
+
+    with patch("subprocess.run", side_effect=busy), patch("time.sleep"):
+        result = controller.wait_for_idle("md.obsidian", timeout_s=0.0)
+
+    assert "busy" in result
+
+
 # ---------------------------------------------------------------------------
 # Serial handling for new methods
 # ---------------------------------------------------------------------------
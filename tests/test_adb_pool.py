@@ -0,0 +1,117 @@
+"""Unit tests for AdbControllerPool (no real ADB required)."""
+
+from __future__ import annotations
+
+import subprocess
+import threading
+import time
+from collections.abc import Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from qualgent.tools.adb_backend import MockAdbBackend
+from qualgent.tools.adb_controller import AdbController, AdbError
+from qualgent.tools.adb_pool import AdbControllerPool
+
+SERIALS = ["emulator-5554", "emulator-5556", "emulator-5558"]
+
+
+@pytest.fixture
+def pool() -> Iterator[AdbControllerPool]:
+    """Return a pool over three emulators."""
+    with AdbControllerPool([AdbController(device_serial=s) for s in SERIALS]) as p:
+        yield p
+
+
+def test_map_runs_on_every_device(pool: AdbControllerPool) -> None:
+    """map calls the method once per controller and keeps device order."""
+    mock_result = MagicMock()
+    mock_result.returncode = 0
+    mock_result.stdout = ""
+    mock_result.stderr = ""
+
+    with patch("subprocess.run", return_value=mock_result) as mock_run:
+        results = pool.map("tap_coordinates", 100, 200)
+
+    assert results == ["Tapped at (100, 200)"] * 3
+    serials = sorted(call[0][0][2] for call in mock_run.call_args_list)
+    assert serials == SERIALS
+
+
+def test_map_raises_first_device_error(pool: AdbControllerPool) -> None:
+    """A failing device surfaces its AdbError."""
+    mock_result = MagicMock()
+    mock_result.returncode = 1
+    mock_result.stdout = ""
+    mock_result.stderr = "error: device offline"
+
+    with patch("subprocess.run", return_value=mock_result):
+        with pytest.raises(AdbError) as exc_info:
+            pool.map("send_key_event", 4)
+
+    assert "device offline" in str(exc_info.value)
+
+
+def test_map_timeout_raises_adb_error(pool: AdbControllerPool) -> None:
+    """Devices that miss the shared deadline raise AdbError."""
+    mock_result = MagicMock()
+    mock_result.returncode = 0
+    mock_result.stdout = ""
+    mock_result.stderr = ""
+
+    def slow_run(*args: object, **kwargs: object) -> MagicMock:
+        time.sleep(0.2)
+        return mock_result
+
+    with patch("subprocess.run", side_effect=slow_run):
+        with pytest.raises(AdbError) as exc_info:
+            pool.map("home", deadline_s=0.01)
+
+    assert "timed out" in str(exc_info.value)
+
+
+def test_method_shorthand_dispatches_to_map(pool: AdbControllerPool) -> None:
+    """Controller methods called on the pool fan out like map."""
+    with patch.object(pool, "map", return_value=["ok"] * 3) as mock_map:
+        assert pool.swipe(1, 2, 3, 4, duration_ms=100) == ["ok"] * 3
+
+    mock_map.assert_called_once_with("swipe", 1, 2, 3, 4, duration_ms=100)
+    with pytest.raises(AttributeError):
+        pool.not_a_method  # noqa: B018
+    with pytest.raises(AttributeError):
+        pool._run  # noqa: B018
+
+
+def test_shorthand_forwards_method_timeout(pool: AdbControllerPool) -> None:
+    """A method's own timeout_s reaches the controllers, not the pool deadline."""
+    with patch.object(AdbController, "wait_for_idle", return_value="idle") as mock_wait:
+        assert pool.wait_for_idle("md.obsidian", timeout_s=3) == ["idle"] * 3
+
+    assert mock_wait.call_count == 3
+    mock_wait.assert_called_with("md.obsidian", timeout_s=3)
+
+
+def test_from_serials_runs_devices_concurrently() -> None:
+    """All four device commands are in flight at the same time."""
+    serials = [f"emulator-{5554 + 2 * i}" for i in range(4)]
+    # Breaks (and fails the call) unless every device reaches it together
+    barrier = threading.Barrier(len(serials), timeout=5)
+
+    def rendezvous(cmd: list[str]) -> subprocess.CompletedProcess:
+        barrier.wait()
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    backend = MockAdbBackend(default=rendezvous)
+
+    with AdbControllerPool.from_serials(serials, backend=backend) as pool:
+        results = pool.tap_coordinates(10, 20)
+
+    assert results == ["Tapped at (10, 20)"] * 4
+    assert sorted(c.cmd[2] for c in backend.calls) == serials
+
+
+def test_empty_pool_rejected() -> None:
+    """A pool needs at least one controller."""
+    with pytest.raises(ValueError):
+        AdbControllerPool([])
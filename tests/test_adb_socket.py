@@ -0,0 +1,171 @@
+"""Unit tests for the adb smart-socket transport (in-process fake server)."""
+
+from __future__ import annotations
+
+import socket
+import threading
+from collections.abc import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from qualgent.tools.adb_backend import MockAdbBackend
+from qualgent.tools.adb_controller import AdbController, AdbError
+from qualgent.tools.adb_socket import AdbSocketClient
+
+
+# ---------------------------------------------------------------------------
+# Fake adb server
+# ---------------------------------------------------------------------------
+
+
+class FakeAdbServer:
+    """Speaks just enough of the adb server protocol to serve shell commands.
+
+    Each connection expects a transport request followed by a ``shell:``
+    request; the reply is ``output`` plus the client's exit-status marker.
+    """
+
+    def __init__(self, output: bytes = b"", returncode: int = 0) -> None:
+        self.output = output
+        self.returncode = returncode
+        self.fail_transport: str | None = None
+        self.requests: list[str] = []
+        self._listener = socket.create_server(("127.0.0.1", 0))
+        self.port = self._listener.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def close(self) -> None:
+        self._listener.close()
+
+    def _serve(self) -> None:
+        while True:
+            try:
+                conn, _ = self._listener.accept()
+            except OSError:
+                return
+            with conn:
+                self._handle(conn)
+
+    def _handle(self, conn: socket.socket) -> None:
+        transport = self._read_request(conn)
+        if self.fail_transport is not None:
+            msg = self.fail_transport.encode()
+            conn.sendall(b"FAIL" + b"%04x" % len(msg) + msg)
+            return
+        conn.sendall(b"OKAY")
+        service = self._read_request(conn)
+        conn.sendall(b"OKAY")
+        self.requests.append(transport)
+        self.requests.append(service)
+        conn.sendall(self.output + b"__QGSOCK__%d\n" % self.returncode)
+
+    def _read_request(self, conn: socket.socket) -> str:
+        length = int(conn.recv(4), 16)
+        data = b""
+        while len(data) < length:
+            data += conn.recv(length - len(data))
+        return data.decode()
+
+
+@pytest.fixture
+def server(monkeypatch: pytest.MonkeyPatch) -> Iterator[FakeAdbServer]:
+    """Start a fake adb server and point ANDROID_ADB_SERVER_PORT at it."""
+    srv = FakeAdbServer()
+    monkeypatch.setenv("ANDROID_ADB_SERVER_PORT", str(srv.port))
+    yield srv
+    srv.close()
+
+
+def socket_controller(device_serial: str | None = None) -> AdbController:
+    """Return a socket-transport controller (talks to the fake server)."""
+    return AdbController(device_serial, transport="socket", timeout_s=5.0)
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+def test_tap_coordinates_spawns_no_process(server: FakeAdbServer) -> None:
+    """In socket mode, shell commands go to the server without any subprocess."""
+    controller = socket_controller("emulator-5554")
+
+    with patch("subprocess.run") as mock_run, patch("subprocess.Popen") as mock_popen:
+        result = controller.tap_coordinates(100, 200)
+
+    mock_run.assert_not_called()
+    mock_popen.assert_not_called()
+    assert result == "Tapped at (100, 200)"
+    assert server.requests[0] == "host:transport:emulator-5554"
+    assert server.requests[1].startswith("shell:( input tap 100 200\n)")
+
+
+def test_without_serial_uses_any_transport(server: FakeAdbServer) -> None:
+    """With no serial the request targets the only connected device."""
+    socket_controller().send_key_event(4)
+
+    assert server.requests[0] == "host:transport-any"
+
+
+def test_returns_command_output(server: FakeAdbServer) -> None:
+    """Shell output before the status marker is returned to the caller."""
+    server.output = b"Physical size: 1080x2400\n"
+
+    assert socket_controller().get_screen_size() == (1080, 2400)
+
+
+def test_nonzero_exit_raises(server: FakeAdbServer) -> None:
+    """A failing command raises AdbError with its exit status."""
+    server.output = b"Unknown package: md.obsidian\n"
+    server.returncode = 1
+
+    with pytest.raises(AdbError) as exc_info:
+        socket_controller().force_stop("md.obsidian")
+
+    assert exc_info.value.returncode == 1
+
+
+def test_server_fail_response_raises(server: FakeAdbServer) -> None:
+    """A FAIL reply from the server (e.g. unknown device) surfaces as AdbError."""
+    server.fail_transport = "device 'emulator-9999' not found"
+
+    with pytest.raises(AdbError, match="not found"):
+        socket_controller("emulator-9999").send_key_event(4)
+
+
+def test_client_reports_exit_status(server: FakeAdbServer) -> None:
+    """AdbSocketClient.shell returns (exit code, output)."""
+    server.output = b"hello\n"
+    server.returncode = 3
+
+    assert AdbSocketClient(timeout_s=5.0).shell("echo hello") == (3, "hello\n")
+
+
+def test_unreachable_server_raises() -> None:
+    """A refused connection raises ConnectionRefusedError from the client."""
+    with socket.create_server(("127.0.0.1", 0)) as probe:
+        port = probe.getsockname()[1]
+
+    with pytest.raises(ConnectionRefusedError):
+        AdbSocketClient(port=port, timeout_s=1.0).shell("true")
+
+
+def test_socket_transport_rejects_persistent_shell() -> None:
+    """The two shell fast paths are mutually exclusive."""
+    with pytest.raises(ValueError):
+        AdbController(transport="socket", persistent_shell=True)
+
+
+
+def test_unreachable_server_is_started_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A refused connection triggers one `adb start-server` before giving up."""
+    with socket.create_server(("127.0.0.1", 0)) as probe:
+        monkeypatch.setenv("ANDROID_ADB_SERVER_PORT", str(probe.getsockname()[1]))
+    backend = MockAdbBackend()
+    controller = AdbController(transport="socket", timeout_s=1.0, backend=backend)
+
+    with pytest.raises(AdbError, match="adb server request failed"):
+        controller.send_key_event(4)
+
+    assert [c.cmd for c in backend.calls] == [["adb", "start-server"]]
@@ -0,0 +1,237 @@
+"""Unit tests for AsyncAdbController (no real ADB required)."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from qualgent.tools.adb_controller import AdbController, AdbError
+from qualgent.tools.async_adb_controller import AsyncAdbController
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def make_process(
+    stdout: bytes = b"", stderr: bytes = b"", returncode: int = 0
+) -> MagicMock:
+    """Return a fake asyncio subprocess."""
+    proc = MagicMock()
+    proc.returncode = returncode
+    proc.communicate = AsyncMock(return_value=(stdout, stderr))
+    proc.wait = AsyncMock(return_value=returncode)
+    return proc
+
+
+@pytest.fixture
+def controller() -> AsyncAdbController:
+    """Return an AsyncAdbController with no device serial."""
+    return AsyncAdbController()
+
+
+# ---------------------------------------------------------------------------
+# Command tests
+# ---------------------------------------------------------------------------
+
+
+def test_tap_coordinates(controller: AsyncAdbController) -> None:
+    """tap_coordinates spawns the same command as the sync controller."""
+    with patch(
+        "asyncio.create_subprocess_exec", new=AsyncMock(return_value=make_process())
+    ) as mock_exec:
+        result = asyncio.run(controller.tap_coordinates(100, 200))
+
+    assert mock_exec.call_args[0] == ("adb", "shell", "input", "tap", "100", "200")
+    assert result == "Tapped at (100, 200)"
+
+
+def test_take_screenshot_with_serial(tmp_path: Path) -> None:
+    """take_screenshot streams PNG bytes to the file and includes -s <serial>."""
+    fake_png = b"\x89PNG\r\n\x1a\n"
+    controller = AsyncAdbController(device_serial="emulator-5554")
+    screenshot_path = tmp_path / "out.png"
+
+    async def fake_exec(*cmd: str, **kwargs: object) -> MagicMock:
+        kwargs["stdout"].write(fake_png)  # type: ignore[attr-defined]
+        return make_process(stdout=None)  # type: ignore[arg-type]
+
+    with patch(
+        "asyncio.create_subprocess_exec", new=AsyncMock(side_effect=fake_exec)
+    ) as mock_exec:
+        asyncio.run(controller.take_screenshot(screenshot_path))
+
+    assert mock_exec.call_args[0] == (
+        "adb", "-s", "emulator-5554", "exec-out", "screencap", "-p",
+    )
+    assert screenshot_path.read_bytes() == fake_png
+
+
+def test_take_screenshot_failure_removes_partial_file(
+    controller: AsyncAdbController, tmp_path: Path
+) -> None:
+    """A failed capture raises AdbError and leaves no truncated PNG behind."""
+    screenshot_path = tmp_path / "out.png"
+
+    async def fake_exec(*cmd: str, **kwargs: object) -> MagicMock:
+        kwargs["stdout"].write(b"\x89PNG")  # type: ignore[attr-defined]
+        return make_process(stdout=None, stderr=b"error: closed", returncode=1)  # type: ignore[arg-type]
+
+    with patch("asyncio.create_subprocess_exec", new=AsyncMock(side_effect=fake_exec)):
+        with pytest.raises(AdbError):
+            asyncio.run(controller.take_screenshot(screenshot_path))
+
+    assert not screenshot_path.exists()
+
+
+def test_get_screen_size(controller: AsyncAdbController) -> None:
+    """get_screen_size parses wm size output."""
+    with patch(
+        "asyncio.create_subprocess_exec",
+        new=AsyncMock(return_value=make_process(stdout=b"Physical size: 1080x1920\n")),
+    ):
+        assert asyncio.run(controller.get_screen_size()) == (1080, 1920)
+
+
+def test_get_screen_size_is_cached(controller: AsyncAdbController) -> None:
+    """get_screen_size queries the device once until the cache is invalidated."""
+
+    async def query_twice() -> list[tuple[int, int]]:
+        return [await controller.get_screen_size(), await controller.get_screen_size()]
+
+    with patch(
+        "asyncio.create_subprocess_exec",
+        new=AsyncMock(return_value=make_process(stdout=b"Physical size: 1080x1920\n")),
+    ) as mock_exec:
+        assert asyncio.run(query_twice()) == [(1080, 1920)] * 2
+        mock_exec.assert_called_once()
+
+        controller.invalidate_cache()
+        asyncio.run(controller.get_screen_size())
+
+    assert mock_exec.call_count == 2
+
+
+def test_is_package_installed_caches_package_list(controller: AsyncAdbController) -> None:
+    """Package lookups share one `pm list packages` call and match exact names."""
+    listing = b"package:md.obsidian\r\npackage:md.obsidian.beta\r\n"
+
+    async def lookups() -> list[bool]:
+        return [
+            await controller.is_package_installed("md.obsidian"),
+            await controller.is_package_installed("md.obsidian.beta"),
+            await controller.is_package_installed("md.obs"),
+        ]
+
+    with patch(
+        "asyncio.create_subprocess_exec",
+        new=AsyncMock(return_value=make_process(stdout=listing)),
+    ) as mock_exec:
+        assert asyncio.run(lookups()) == [True, True, False]
+
+    mock_exec.assert_called_once()
+
+
+def test_gather_across_devices() -> None:
+    """Commands for several devices can be awaited concurrently."""
+    controllers = [AsyncAdbController(device_serial=f"emulator-{5554 + 2 * i}") for i in range(3)]
+
+    async def run_all() -> list[str]:
+        return await asyncio.gather(*(c.send_key_event(4) for c in controllers))
+
+    with patch(
+        "asyncio.create_subprocess_exec", new=AsyncMock(return_value=make_process())
+    ) as mock_exec:
+        results = asyncio.run(run_all())
+
+    assert results == ["Sent key event: 4"] * 3
+    serials = {call[0][2] for call in mock_exec.call_args_list}
+    assert serials == {"emulator-5554", "emulator-5556", "emulator-5558"}
+
+
+def test_screenshot_overlaps_llm_call(tmp_path: Path) -> None:
+    """A screenshot and an LLM call gathered together run concurrently."""
+    fake_png = b"\x89PNG\r\n\x1a\n"
+    controller = AsyncAdbController()
+    llm_started = asyncio.Event()
+
+    async def fake_exec(*cmd: str, **kwargs: object) -> MagicMock:
+        proc = make_process()
+
+        async def communicate() -> tuple[None, bytes]:
+            # Only finishes once the LLM call is in flight, so a serial
+            # implementation would hang here.
+            await llm_started.wait()
+            kwargs["stdout"].write(fake_png)  # type: ignore[attr-defined]
+            return None, b""
+
+        proc.communicate = communicate
+        return proc
+
+    async def gemini_call() -> dict[str, str]:
+        llm_started.set()
+        await asyncio.sleep(0)
+        return {"verdict": "PASS"}
+
+    async def plan_verify() -> list[object]:
+        return await asyncio.wait_for(
+            asyncio.gather(controller.take_screenshot(tmp_path / "shot.png"), gemini_call()),
+            timeout=1.0,
+        )
+
+    with patch("asyncio.create_subprocess_exec", new=AsyncMock(side_effect=fake_exec)):
+        shot, verdict = asyncio.run(plan_verify())
+
+    assert shot == f"Saved screenshot to {tmp_path / 'shot.png'}"
+    assert verdict == {"verdict": "PASS"}
+    assert (tmp_path / "shot.png").read_bytes() == fake_png
+
+
+# ---------------------------------------------------------------------------
+# Error handling tests
+# ---------------------------------------------------------------------------
+
+
+def test_adb_error_on_command_failure(controller: AsyncAdbController) -> None:
+    """AdbError is raised when command fails."""
+    proc = make_process(stderr=b"error: device not found", returncode=1)
+    with patch("asyncio.create_subprocess_exec", new=AsyncMock(return_value=proc)):
+        with pytest.raises(AdbError) as exc_info:
+            asyncio.run(controller.tap_coordinates(0, 0))
+
+    assert exc_info.value.returncode == 1
+    assert "device not found" in str(exc_info.value)
+
+
+def test_timeout_raises_adb_error() -> None:
+    """A command exceeding timeout_s is killed and raises AdbError."""
+    controller = AsyncAdbController(timeout_s=0.01)
+    proc = make_process()
+
+    async def hang() -> tuple[bytes, bytes]:
+        await asyncio.sleep(1)
+        return b"", b""
+
+    proc.communicate = hang
+    with patch("asyncio.create_subprocess_exec", new=AsyncMock(return_value=proc)):
+        with pytest.raises(AdbError) as exc_info:
+            asyncio.run(controller.tap_coordinates(0, 0))
+
+    proc.kill.assert_called_once()
+    assert "timed out" in str(exc_info.value).lower()
+
+
+def test_mirrors_sync_device_actions() -> None:
+    """Every sync action has a coroutine twin, except the documented sync-only ones."""
+
+    def public(cls: type) -> set[str]:
+        return {n for n in dir(cls) if not n.startswith("_") and callable(getattr(cls, n))}
+
+    missing = public(AdbController) - public(AsyncAdbController)
+
+    assert missing == {"close", "compile_sequence", "run_gesture", "wait_async"}
+    assert asyncio.iscoroutinefunction(AsyncAdbController.tap_text)
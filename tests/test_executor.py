@@ -0,0 +1,199 @@
+"""Unit tests for Executor (no real ADB required)."""
+
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from qualgent.agent.executor import Executor, ExecutorError
+from qualgent.agent.planner import Planner
+from qualgent.agent.types import Action, ActionType, ErrorType
+from qualgent.tools.adb_backend import MockAdbBackend
+from qualgent.tools.adb_controller import AdbController, AdbError
+
+
+@pytest.fixture
+def executor() -> Executor:
+    """Return an Executor for a 1080x2160 screen with no device serial."""
+    return Executor(AdbController(), 1080, 2160)
+
+
+def ok_result() -> MagicMock:
+    """Return a successful subprocess.run result."""
+    mock_result = MagicMock()
+    mock_result.returncode = 0
+    mock_result.stdout = ""
+    mock_result.stderr = ""
+    return mock_result
+
+
+# ---------------------------------------------------------------------------
+# compile_actions tests
+# ---------------------------------------------------------------------------
+
+
+def test_compile_actions_uploads_once_and_runs_in_one_call(executor: Executor) -> None:
+    """A compiled action list is written once and replayed with one adb call."""
+    actions = [
+        Action(ActionType.TAP, {"x": 0.5, "y": 0.5}),
+        Action(ActionType.TYPE_TEXT, {"text": "Hello world"}),
+        Action(ActionType.KEY_EVENT, {"key_code": 66}),
+        Action(ActionType.WAIT, {"seconds": 0.5}),
+    ]
+
+    with patch("subprocess.run", return_value=ok_result()) as mock_run:
+        seq = executor.compile_actions(actions)
+        again = executor.compile_actions(actions)
+        seq.run()
+        seq.run()
+
+    assert again.path == seq.path
+    assert seq.path.startswith("/data/local/tmp/qg_seq_")
+    assert seq.commands == (
+        "input tap 540 1080",
+        "input text Hello%sworld",
+        "input keyevent 66",
+        "sleep 0.5",
+    )
+    cmds = [c[0][0] for c in mock_run.call_args_list]
+    assert len(cmds) == 3  # one upload, two runs
+    assert cmds[0][:2] == ["adb", "shell"]
+    assert f"> {seq.path}" in cmds[0][2]
+    assert cmds[1] == cmds[2] == ["adb", "shell", "sh", seq.path]
+
+
+@pytest.mark.parametrize(
+    ("seconds", "expected"),
+    [(0.00001, "sleep 0"), (0.0125, "sleep 0.013"), (2, "sleep 2"), (1e6, "sleep 1000000")],
+)
+def test_wait_compiles_to_fixed_point_sleep(
+    executor: Executor, seconds: float, expected: str
+) -> None:
+    """WAIT never emits exponent notation, which toybox sleep rejects."""
+    with patch("subprocess.run", return_value=ok_result()):
+        seq = executor.compile_actions([Action(ActionType.WAIT, {"seconds": seconds})])
+
+    assert seq.commands == (expected,)
+
+
+def test_compile_actions_rejects_ui_lookup_actions(executor: Executor) -> None:
+    """Actions that need a UI dump cannot be compiled."""
+    with pytest.raises(ExecutorError) as exc_info:
+        executor.compile_actions([Action(ActionType.TAP_TEXT, {"text": "OK"})])
+
+    assert exc_info.value.error_type == ErrorType.INVALID_PARAMS
+
+
+# ---------------------------------------------------------------------------
+# Batched execution tests
+# ---------------------------------------------------------------------------
+
+
+def test_execute_batch_joins_commands(executor: Executor) -> None:
+    """execute_batch chains with && by default and ; when not stopping on error."""
+    adb = AdbController()
+    with patch("subprocess.run", return_value=ok_result()) as mock_run:
+        adb.execute_batch(["input tap 1 2", "input keyevent 4"])
+        adb.execute_batch(["input tap 1 2", "input keyevent 4"], stop_on_error=False)
+
+    first, second = (c[0][0] for c in mock_run.call_args_list)
+    assert first == ["adb", "shell", "input tap 1 2 && input keyevent 4"]
+    assert second == ["adb", "shell", "input tap 1 2; input keyevent 4"]
+
+
+def test_planned_actions_run_in_one_adb_call(executor: Executor) -> None:
+    """A tap -> type_text -> key_event plan collapses into one subprocess.run."""
+    gemini = MagicMock()
+    gemini.generate_json.return_value = {
+        "actions": [
+            {"action_type": "tap", "params": {"x": 0.5, "y": 0.5}, "description": "Tap field"},
+            {"action_type": "type_text", "params": {"text": "Hello"}, "description": "Type text"},
+            {"action_type": "key_event", "params": {"key_code": 66}, "description": "Press enter"},
+        ],
+        "stop_condition": "Form submitted",
+        "notes": "",
+        "is_complete": False,
+    }
+    plan = Planner(gemini).plan_next_actions(
+        test_goal="Fill form",
+        screenshot_path=Path("/fake/screenshot.png"),
+    )
+
+    with patch("subprocess.run", return_value=ok_result()) as mock_run:
+        results = executor.execute_all(plan.actions)
+
+    mock_run.assert_called_once()
+    assert mock_run.call_args[0][0][-1] == (
+        "input tap 540 1080 && echo __QG_STEP__0 && "
+        "input text Hello && echo __QG_STEP__1 && input keyevent 66"
+    )
+    assert [r.success for r in results] == [True, True, True]
+
+
+def test_execute_all_runs_ui_actions_between_batches(executor: Executor) -> None:
+    """Actions needing a UI dump split the batch and run on their own."""
+    actions = [
+        Action(ActionType.TAP, {"x": 0.5, "y": 0.5}),
+        Action(ActionType.KEY_EVENT, {"key_code": 4}),
+        Action(ActionType.TAP_TEXT, {"text": "OK"}),
+        Action(ActionType.HOME),
+    ]
+
+    with (
+        patch.object(AdbController, "execute_batch") as mock_batch,
+        patch.object(AdbController, "tap_text", return_value="tapped") as mock_tap_text,
+        patch.object(AdbController, "home") as mock_home,
+    ):
+        results = executor.execute_all(actions)
+
+    mock_batch.assert_called_once_with(
+        ["input tap 540 1080", "echo __QG_STEP__0", "input keyevent 4"]
+    )
+    mock_tap_text.assert_called_once_with("OK", partial=False)
+    mock_home.assert_called_once()
+    assert len(results) == 4
+
+
+def test_execute_all_batch_failure_stops(executor: Executor) -> None:
+    """A failing batch reports one failed result and stops."""
+    actions = [
+        Action(ActionType.TAP, {"x": 0.1, "y": 0.1}),
+        Action(ActionType.BACK),
+        Action(ActionType.TAP_TEXT, {"text": "OK"}),
+    ]
+
+    with (
+        patch.object(AdbController, "execute_batch", side_effect=AdbError("boom")),
+        patch.object(AdbController, "tap_text") as mock_tap_text,
+    ):
+        results = executor.execute_all(actions)
+
+    mock_tap_text.assert_not_called()
+    assert len(results) == 1
+    assert results[0].success is False
+    assert results[0].error_type == ErrorType.ADB_FAILURE
+
+
+def test_execute_all_batch_failure_reports_failing_action() -> None:
+    """A mid-batch failure keeps earlier successes and blames the failing action."""
+    backend = MockAdbBackend(
+        default=subprocess.CompletedProcess(
+            [], 1, "__QG_STEP__0\n__QG_STEP__1\n", "Error: Unknown keycode"
+        )
+    )
+    executor = Executor(AdbController(backend=backend), 1080, 2160)
+    actions = [
+        Action(ActionType.TAP, {"x": 0.1, "y": 0.1}),
+        Action(ActionType.BACK),
+        Action(ActionType.KEY_EVENT, {"key_code": 9999}),
+        Action(ActionType.HOME),
+    ]
+
+    results = executor.execute_all(actions)
+
+    assert [r.success for r in results] == [True, True, False]
+    assert results[2].action is actions[2]
+    assert len(backend.calls) == 1
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import io
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -121,6 +122,21 @@ class TestPlannerParsing:
         assert result.is_complete is True
         assert len(result.actions) == 0
 
+    def test_action_type_is_case_insensitive(self, planner: Planner, mock_gemini: MagicMock) -> None:
+        """Planner accepts action types regardless of case."""
+        mock_gemini.generate_json.return_value = {
+            "action": {"action_type": "Tap_Text", "params": {"text": "OK"}},
+            "reasoning": "",
+            "is_complete": False,
+        }
+
+        result = planner.plan_next_actions(
+            test_goal="Confirm",
+            screenshot_path=Path("/fake/screenshot.png"),
+        )
+
+        assert result.actions[0].action_type == ActionType.TAP_TEXT
+
     def test_invalid_action_type_raises_error(self, planner: Planner, mock_gemini: MagicMock) -> None:
         """Planner raises error for invalid action type."""
         mock_gemini.generate_json.return_value = {
@@ -243,6 +259,20 @@ class TestSupervisorParsing:
 
         assert result.status == TestStatus.FAILED
 
+    @pytest.mark.parametrize(("raw", "expected"), [(" passed\n", TestStatus.PASSED), (None, TestStatus.FAILED)])
+    def test_status_is_normalized(
+        self, supervisor: Supervisor, mock_gemini: MagicMock, raw: object, expected: TestStatus
+    ) -> None:
+        """Supervisor trims status strings and treats a null status as FAILED."""
+        mock_gemini.generate_json.return_value = {"status": raw, "evidence": ""}
+
+        result = supervisor.verify_step(
+            expected_result="Something",
+            screenshot_path=Path("/fake/screenshot.png"),
+        )
+
+        assert result.status == expected
+
     def test_missing_confidence_defaults(self, supervisor: Supervisor, mock_gemini: MagicMock) -> None:
         """Supervisor uses default confidence if not provided."""
         mock_gemini.generate_json.return_value = {
@@ -257,6 +287,50 @@ class TestSupervisorParsing:
 
         assert result.confidence == 0.5  # Default
 
+    def test_verify_step_accepts_screenshot_bytes(self, mock_gemini: MagicMock) -> None:
+        """With downscaling off, in-memory screenshots reach the LLM client as-is."""
+        Image = pytest.importorskip("PIL.Image")
+        buf = io.BytesIO()
+        Image.new("RGB", (1080, 1920)).save(buf, "PNG")
+        png = buf.getvalue()
+        mock_gemini.generate_json.return_value = {"status": "PASSED", "confidence": 0.9}
+        supervisor = Supervisor(mock_gemini, max_image_side=None)
+
+        result = supervisor.verify_step(expected_result="Home screen", screenshot_path=png)
+
+        assert result.status == TestStatus.PASSED
+        assert mock_gemini.generate_json.call_args.kwargs["images"] == [png]
+
+    def test_screenshot_within_limit_is_not_reencoded(
+        self, supervisor: Supervisor, mock_gemini: MagicMock
+    ) -> None:
+        """A screenshot that already fits max_image_side is sent unchanged."""
+        Image = pytest.importorskip("PIL.Image")
+        buf = io.BytesIO()
+        Image.new("RGB", (540, 960)).save(buf, "PNG")
+        png = buf.getvalue()
+        mock_gemini.generate_json.return_value = {"status": "PASSED"}
+
+        supervisor.verify_step(expected_result="Home screen", screenshot_path=png)
+
+        assert mock_gemini.generate_json.call_args.kwargs["images"] == [png]
+
+    def test_screenshot_is_downscaled_before_upload(
+        self, supervisor: Supervisor, mock_gemini: MagicMock
+    ) -> None:
+        """A full-size screenshot is sent to the LLM as a small JPEG."""
+        Image = pytest.importorskip("PIL.Image")
+        buf = io.BytesIO()
+        Image.new("RGB", (1080, 1920)).save(buf, "PNG")
+        mock_gemini.generate_json.return_value = {"status": "PASSED"}
+
+        supervisor.verify_step(expected_result="Home screen", screenshot_path=buf.getvalue())
+
+        (sent,) = mock_gemini.generate_json.call_args.kwargs["images"]
+        assert sent.startswith(b"\xff\xd8\xff")
+        assert len(sent) < 200_000
+        assert max(Image.open(io.BytesIO(sent)).size) <= 1024
+
     def test_verify_test_completion(self, supervisor: Supervisor, mock_gemini: MagicMock) -> None:
         """Supervisor verifies complete test with action history."""
         mock_gemini.generate_json.return_value = {